@@ -29,6 +29,7 @@ class AzureOpenAIService:
     def __init__(self):
         # Load environment variables
         load_dotenv()
+        RudhConfig.reload()
         
         self.config = RudhConfig.get_config()
         self.azure_config = self.config['azure']['openai']
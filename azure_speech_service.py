@@ -49,6 +49,7 @@ class AzureSpeechService:
         # Load environment variables if available
         if DOTENV_AVAILABLE:
             load_dotenv()
+            RudhConfig.reload()
         
         self.config = RudhConfig.get_config()
         self.speech_config = self.config['azure']['speech']
@@ -5,11 +5,362 @@ Complete environment setup for Azure Speech integration with video creation
 """
 
 import os
+import re
+import hashlib
+import gzip
 import sys
 import subprocess
 import json
+import pprint
+import py_compile
+import importlib.metadata
+import functools
+import shutil
 from pathlib import Path
 
+# packaging ships alongside pip in virtually every environment, but keep setup usable without it
+try:
+    from packaging.requirements import Requirement
+    from packaging.version import Version
+    PACKAGING_AVAILABLE = True
+except ImportError:
+    PACKAGING_AVAILABLE = False
+
+# Static files (setup guide, env template, test scripts) are copied from here
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def minified_json_path(path) -> Path:
+    """Path of the compact machine-read copy of a generated JSON file (foo.json -> foo.min.json.gz)"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.min.json.gz")
+
+@functools.lru_cache(maxsize=1)
+def load_voice_config(path: str = "voice_config.json") -> dict:
+    """Canonical read path for the generated voice_config.json (parsed once per process)
+    
+    The compact copy is used only while it is at least as new as the JSON; after a hand
+    edit the JSON is read and the compact copy regenerated.
+    """
+    compact_path = minified_json_path(path)
+    try:
+        compact_fresh = compact_path.stat().st_mtime_ns >= Path(path).stat().st_mtime_ns
+    except OSError:
+        compact_fresh = compact_path.exists()
+    
+    if compact_fresh:
+        with gzip.open(compact_path, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    config = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    try:
+        write_minified_json(path, config)
+    except OSError as e:
+        print(f"⚠️ Could not refresh {compact_path}: {e}")
+    return config
+
+@functools.lru_cache(maxsize=32)
+def get_persona(name: str) -> dict:
+    """Get a voice persona from the cached voice configuration (treat as read-only)"""
+    return load_voice_config()["voice_personas"][name]
+
+# Generated configuration and templates - built once at import and treated as
+# read-only constants; the create_* functions below only serialize them.
+
+# Azure Speech configuration template
+VOICE_CONFIG = {
+    "azure_speech": {
+        "region": "eastus2",
+        "voice_default": "en-IN-NeerjaNeural",
+        "audio_format": "Audio48Khz192KBitRateMonoMp3",
+        "timeout": 30
+    },
+    "voice_personas": {
+        "professional": {
+            "voice": "en-IN-NeerjaNeural",
+            "style": "newscast",
+            "rate": "0%",
+            "pitch": "0%",
+            "description": "Professional business tone"
+        },
+        "enthusiastic": {
+            "voice": "en-IN-NeerjaNeural", 
+            "style": "cheerful",
+            "rate": "+10%",
+            "pitch": "+5%",
+            "description": "Energetic and engaging"
+        },
+        "authoritative": {
+            "voice": "en-IN-PrabhatNeural",
+            "style": "newscast",
+            "rate": "-5%",
+            "pitch": "-5%",
+            "description": "Confident and credible"
+        },
+        "friendly": {
+            "voice": "en-IN-NeerjaNeural",
+            "style": "friendly",
+            "rate": "0%",
+            "pitch": "0%",
+            "description": "Warm and approachable"
+        },
+        "tamil_friendly": {
+            "voice": "ta-IN-PallaviNeural",
+            "style": "friendly",
+            "rate": "0%",
+            "pitch": "0%",
+            "description": "Tamil voice for cultural authenticity"
+        }
+    },
+    "quality_presets": {
+        "presentation_quality": {
+            "resolution": [1920, 1080],
+            "video_bitrate": 6000000,
+            "audio_bitrate": 192000,
+            "fps": 30
+        },
+        "web_optimized": {
+            "resolution": [1280, 720],
+            "video_bitrate": 2500000,
+            "audio_bitrate": 128000,
+            "fps": 25
+        },
+        "mobile_friendly": {
+            "resolution": [854, 480],
+            "video_bitrate": 1200000,
+            "audio_bitrate": 96000,
+            "fps": 24
+        }
+    }
+}
+
+
+# Business presentation template
+BUSINESS_TEMPLATE = {
+    "name": "Chennai Business Presentation",
+    "description": "Professional business presentation with Indian English narration",
+    "voice_persona": "professional",
+    "template_type": "business_presentation",
+    "scenes": [
+        {
+            "type": "title",
+            "template": "{title}\nPowered by Rudh AI",
+            "narration_template": "Welcome to our comprehensive presentation on {topic}. Let's explore the key insights and opportunities.",
+            "duration": 45
+        },
+        {
+            "type": "overview",
+            "template": "Overview\n• Key Concepts\n• Market Analysis\n• Strategic Insights",
+            "narration_template": "Today's session covers the fundamental concepts, current market dynamics, and strategic insights for {topic}.",
+            "duration": 50
+        },
+        {
+            "type": "content",
+            "template": "Market Opportunities\nChennai Business Landscape",
+            "narration_template": "Chennai's thriving business ecosystem offers exceptional opportunities in {topic}. The city's strategic advantages create competitive benefits.",
+            "duration": 60
+        },
+        {
+            "type": "analysis",
+            "template": "Strategic Analysis\nData-Driven Insights",
+            "narration_template": "Our analysis reveals significant trends and opportunities. These data-driven insights guide strategic decision-making for maximum impact.",
+            "duration": 55
+        },
+        {
+            "type": "implementation",
+            "template": "Implementation Strategy\nAction Plan",
+            "narration_template": "Successful implementation requires a systematic approach. Let's outline the specific steps to achieve your objectives in {topic}.",
+            "duration": 50
+        },
+        {
+            "type": "conclusion",
+            "template": "Thank You\nNext Steps & Discussion",
+            "narration_template": "Thank you for your attention. Let's discuss how we can implement these strategies for your business success.",
+            "duration": 40
+        }
+    ],
+    "total_duration": 300,
+    "style": "corporate_professional",
+    "voice_style": "newscast"
+}
+
+
+# Tech showcase template
+TECH_TEMPLATE = {
+    "name": "Technology Innovation Showcase",
+    "description": "Energetic tech presentation with enthusiastic narration",
+    "voice_persona": "enthusiastic",
+    "template_type": "tech_showcase",
+    "scenes": [
+        {
+            "type": "title",
+            "template": "Technology Innovation\n{title}",
+            "narration_template": "Get ready to discover cutting-edge technology that's transforming {topic}. This is truly exciting!",
+            "duration": 40
+        },
+        {
+            "type": "innovation",
+            "template": "Innovation Spotlight\nBreaking New Ground",
+            "narration_template": "Innovation in {topic} is happening at breakneck speed. Let's explore the technologies that are reshaping entire industries.",
+            "duration": 50
+        },
+        {
+            "type": "applications",
+            "template": "Real-World Applications\nPractical Implementation",
+            "narration_template": "These aren't just concepts – they're real solutions being implemented right here in Chennai and around the world.",
+            "duration": 55
+        },
+        {
+            "type": "benefits",
+            "template": "Transformative Benefits\nMeasurable Impact",
+            "narration_template": "The benefits are remarkable! Companies implementing these {topic} solutions see dramatic improvements in efficiency and results.",
+            "duration": 50
+        },
+        {
+            "type": "future",
+            "template": "Future Possibilities\nWhat's Next",
+            "narration_template": "The future is here, and it's powered by innovation in {topic}. Let's harness this technology for remarkable results.",
+            "duration": 45
+        }
+    ],
+    "total_duration": 240,
+    "style": "tech_modern",
+    "voice_style": "cheerful"
+}
+
+
+# Financial education template
+FINANCE_TEMPLATE = {
+    "name": "Financial Education Series",
+    "description": "Authoritative financial education with expert narration",
+    "voice_persona": "authoritative",
+    "template_type": "financial_education",
+    "scenes": [
+        {
+            "type": "title",
+            "template": "Financial Education Series\n{title}",
+            "narration_template": "Welcome to our financial education series. Today we'll master the fundamentals of {topic}.",
+            "duration": 45
+        },
+        {
+            "type": "fundamentals",
+            "template": "Core Principles\nFoundational Knowledge",
+            "narration_template": "Understanding the core principles of {topic} is essential for making informed financial decisions.",
+            "duration": 60
+        },
+        {
+            "type": "strategies",
+            "template": "Proven Strategies\nExpert Approaches",
+            "narration_template": "Industry experts have developed proven strategies for {topic}. These approaches have been tested across global markets.",
+            "duration": 65
+        },
+        {
+            "type": "implementation",
+            "template": "Practical Implementation\nYour Action Plan",
+            "narration_template": "Remember, successful investing requires knowledge, patience, and disciplined execution. Start your journey today.",
+            "duration": 50
+        }
+    ],
+    "total_duration": 220,
+    "style": "finance_professional",
+    "voice_style": "newscast"
+}
+
+VOICE_TEMPLATES = {
+    "business_presentation": BUSINESS_TEMPLATE,
+    "tech_showcase": TECH_TEMPLATE,
+    "financial_education": FINANCE_TEMPLATE
+}
+
+# Setup-state manifest: sha256 + stat of every generated file, so re-runs skip unchanged work
+SETUP_STATE_PATH = Path(".setup_state.json")
+_setup_state = None
+
+def _get_setup_state() -> dict:
+    """Load the setup-state manifest once per process"""
+    global _setup_state
+    
+    if _setup_state is None:
+        try:
+            with open(SETUP_STATE_PATH, 'rb') as f:
+                data = f.read()
+            _setup_state = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        except (OSError, ValueError):
+            _setup_state = {}
+    
+    return _setup_state
+
+def save_setup_state():
+    """Atomically persist the setup-state manifest"""
+    state = _get_setup_state()
+    data = orjson.dumps(state) if ORJSON_AVAILABLE else json.dumps(state).encode('utf-8')
+    
+    tmp_path = SETUP_STATE_PATH.with_name(SETUP_STATE_PATH.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, SETUP_STATE_PATH)
+
+def _is_up_to_date(path: Path, digest: str) -> bool:
+    """True if path was generated with this content hash and hasn't been touched since"""
+    entry = _get_setup_state().get(str(path))
+    if not entry or entry["sha256"] != digest:
+        return False
+    
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    
+    return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+def _record_generated(path: Path, digest: str):
+    """Remember the content hash and stat of a freshly generated file"""
+    stat = path.stat()
+    _get_setup_state()[str(path)] = {
+        "sha256": digest,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+def write_if_changed(path, content: bytes) -> bool:
+    """Write generated content unless the identical file is already in place"""
+    path = Path(path)
+    digest = hashlib.sha256(content).hexdigest()
+    if _is_up_to_date(path, digest):
+        return False
+    
+    path.write_bytes(content)
+    _record_generated(path, digest)
+    return True
+
+def copy_if_changed(source, destination) -> bool:
+    """Copy a template file unless the identical copy is already in place"""
+    destination = Path(destination)
+    digest = hashlib.sha256(Path(source).read_bytes()).hexdigest()
+    if _is_up_to_date(destination, digest):
+        return False
+    
+    shutil.copyfile(source, destination)
+    _record_generated(destination, digest)
+    return True
+
+def write_minified_json(path, data: dict) -> bool:
+    """Write the gzipped, minified runtime copy next to a human-editable JSON file"""
+    if ORJSON_AVAILABLE:
+        raw = orjson.dumps(data)
+    else:
+        raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    # mtime=0 keeps the gzip bytes deterministic so the setup-state hash stays stable
+    return write_if_changed(minified_json_path(path), gzip.compress(raw, mtime=0))
+
 def print_header():
     """Print setup header"""
     print("🎬🗣️ PHASE 4.4 VOICE-ENHANCED VIDEO CREATION SETUP")
@@ -20,6 +371,25 @@ def print_header():
     print("🏢 Chennai Business Context + AI-Powered Content Generation")
     print()
 
+def is_requirement_satisfied(requirement: str) -> bool:
+    """Check whether an installed distribution already satisfies a requirement spec"""
+    if PACKAGING_AVAILABLE:
+        req = Requirement(requirement)
+        name = req.name
+    else:
+        name = re.split(r"[<>=!~\[ ;]", requirement, maxsplit=1)[0]
+    
+    try:
+        installed_version = importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    
+    if not PACKAGING_AVAILABLE:
+        # Without packaging we can only tell that some version is installed
+        return True
+    
+    return req.specifier.contains(Version(installed_version), prereleases=True)
+
 def install_voice_dependencies():
     """Install voice and audio processing dependencies"""
     print("📦 Installing voice and audio processing dependencies...")
@@ -34,20 +404,42 @@ def install_voice_dependencies():
         'asyncio'
     ]
     
+    missing = []
     for dep in dependencies:
-        try:
-            if dep in ['wave', 'asyncio']:  # Built-in modules
-                print(f"✅ {dep}: Built-in module")
-                continue
-                
-            print(f"📥 Installing {dep}...")
-            subprocess.run([
-                sys.executable, "-m", "pip", "install", dep, "--upgrade"
-            ], check=True, capture_output=True)
-            print(f"✅ {dep}: Installed successfully")
-            
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️ {dep}: Installation failed - {e}")
+        if dep in ['wave', 'asyncio']:  # Built-in modules
+            print(f"✅ {dep}: Built-in module")
+        elif is_requirement_satisfied(dep):
+            print(f"✅ {dep}: already satisfied")
+        else:
+            missing.append(dep)
+    
+    if missing:
+        print(f"📥 Installing {', '.join(missing)}...")
+        
+        # Prefer uv (parallel, Rust-based, pip-compatible) when it's on PATH;
+        # --python pins it to this interpreter's environment like `python -m pip`
+        uv_path = shutil.which("uv")
+        if uv_path:
+            command = [uv_path, "pip", "install", "--python", sys.executable, *missing]
+        else:
+            command = [sys.executable, "-m", "pip", "install", *missing]
+        
+        # Single installer run for every missing package, streaming its output live
+        # instead of buffering it all in memory until the installer exits
+        env = dict(os.environ, PIP_PROGRESS_BAR="off")
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1, env=env
+        ) as process:
+            for line in process.stdout:
+                print(f"   {line.rstrip()}")
+            return_code = process.wait()
+        
+        if return_code == 0:
+            print(f"✅ Installed successfully: {', '.join(missing)}")
+        else:
+            print(f"⚠️ Installation failed ({Path(command[0]).name} exit code {return_code})")
             print(f"   Continuing with setup...")
     
     print("✅ Voice dependencies installation complete!")
@@ -65,9 +457,14 @@ def create_voice_directories():
         "speech_cache"
     ]
     
+    # One directory listing up front instead of a stat + mkdir pair per directory
+    existing = set(os.listdir('.'))
+    
     for directory in directories:
-        dir_path = Path(directory)
-        dir_path.mkdir(exist_ok=True)
+        if directory in existing:
+            print(f"✅ Exists: {directory}/")
+            continue
+        os.makedirs(directory, exist_ok=True)
         print(f"✅ Created: {directory}/")
     
     print("✅ Voice directories created successfully!")
@@ -76,255 +473,52 @@ def create_voice_config():
     """Create voice configuration templates"""
     print("\n🔧 Creating voice configuration templates...")
     
-    # Azure Speech configuration template
-    azure_config = {
-        "azure_speech": {
-            "region": "eastus2",
-            "voice_default": "en-IN-NeerjaNeural",
-            "audio_format": "Audio48Khz192KBitRateMonoMp3",
-            "timeout": 30
-        },
-        "voice_personas": {
-            "professional": {
-                "voice": "en-IN-NeerjaNeural",
-                "style": "newscast",
-                "rate": "0%",
-                "pitch": "0%",
-                "description": "Professional business tone"
-            },
-            "enthusiastic": {
-                "voice": "en-IN-NeerjaNeural", 
-                "style": "cheerful",
-                "rate": "+10%",
-                "pitch": "+5%",
-                "description": "Energetic and engaging"
-            },
-            "authoritative": {
-                "voice": "en-IN-PrabhatNeural",
-                "style": "newscast",
-                "rate": "-5%",
-                "pitch": "-5%",
-                "description": "Confident and credible"
-            },
-            "friendly": {
-                "voice": "en-IN-NeerjaNeural",
-                "style": "friendly",
-                "rate": "0%",
-                "pitch": "0%",
-                "description": "Warm and approachable"
-            },
-            "tamil_friendly": {
-                "voice": "ta-IN-PallaviNeural",
-                "style": "friendly",
-                "rate": "0%",
-                "pitch": "0%",
-                "description": "Tamil voice for cultural authenticity"
-            }
-        },
-        "quality_presets": {
-            "presentation_quality": {
-                "resolution": [1920, 1080],
-                "video_bitrate": 6000000,
-                "audio_bitrate": 192000,
-                "fps": 30
-            },
-            "web_optimized": {
-                "resolution": [1280, 720],
-                "video_bitrate": 2500000,
-                "audio_bitrate": 128000,
-                "fps": 25
-            },
-            "mobile_friendly": {
-                "resolution": [854, 480],
-                "video_bitrate": 1200000,
-                "audio_bitrate": 96000,
-                "fps": 24
-            }
-        }
-    }
-    
     # Save configuration
     config_path = Path("voice_config.json")
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(azure_config, f, indent=2, ensure_ascii=False)
-    
-    print(f"✅ Voice configuration saved: {config_path}")
+    config_json = json.dumps(VOICE_CONFIG, indent=2, ensure_ascii=False)
+    if write_if_changed(config_path, config_json.encode('utf-8')):
+        print(f"✅ Voice configuration saved: {config_path}")
+    else:
+        print(f"✅ Up to date: {config_path}")
+    write_minified_json(config_path, VOICE_CONFIG)
     
     # Create environment template
-    env_template = """# Azure Speech Services Configuration for Rudh Voice Integration
-# Copy this to .env and add your actual Azure credentials
-
-# Azure Speech Services
-AZURE_SPEECH_KEY=your_speech_service_key_here
-AZURE_SPEECH_REGION=eastus2
-AZURE_SPEECH_VOICE=en-IN-NeerjaNeural
-
-# Azure Key Vault (optional)
-AZURE_KEY_VAULT_URL=https://kv-rudh-secrets-eastus2.vault.azure.net/
-
-# Voice Settings
-VOICE_CACHE_ENABLED=true
-VOICE_PLAYBACK_ENABLED=true
-VOICE_QUALITY=high
-
-# Chennai Context
-CHENNAI_CONTEXT_ENABLED=true
-TAMIL_SUPPORT_ENABLED=true
-LOCAL_BUSINESS_THEMES=true
-"""
-    
     env_template_path = Path("voice_config.env.template")
-    with open(env_template_path, 'w', encoding='utf-8') as f:
-        f.write(env_template)
-    
-    print(f"✅ Environment template saved: {env_template_path}")
+    if copy_if_changed(TEMPLATES_DIR / "voice_config.env.template", env_template_path):
+        print(f"✅ Environment template saved: {env_template_path}")
+    else:
+        print(f"✅ Up to date: {env_template_path}")
 
 def create_voice_templates():
     """Create voice-enabled video templates"""
     print("\n🎨 Creating voice-enabled video templates...")
     
-    # Business presentation template
-    business_template = {
-        "name": "Chennai Business Presentation",
-        "description": "Professional business presentation with Indian English narration",
-        "voice_persona": "professional",
-        "template_type": "business_presentation",
-        "scenes": [
-            {
-                "type": "title",
-                "template": "{title}\nPowered by Rudh AI",
-                "narration_template": "Welcome to our comprehensive presentation on {topic}. Let's explore the key insights and opportunities.",
-                "duration": 45
-            },
-            {
-                "type": "overview",
-                "template": "Overview\n• Key Concepts\n• Market Analysis\n• Strategic Insights",
-                "narration_template": "Today's session covers the fundamental concepts, current market dynamics, and strategic insights for {topic}.",
-                "duration": 50
-            },
-            {
-                "type": "content",
-                "template": "Market Opportunities\nChennai Business Landscape",
-                "narration_template": "Chennai's thriving business ecosystem offers exceptional opportunities in {topic}. The city's strategic advantages create competitive benefits.",
-                "duration": 60
-            },
-            {
-                "type": "analysis",
-                "template": "Strategic Analysis\nData-Driven Insights",
-                "narration_template": "Our analysis reveals significant trends and opportunities. These data-driven insights guide strategic decision-making for maximum impact.",
-                "duration": 55
-            },
-            {
-                "type": "implementation",
-                "template": "Implementation Strategy\nAction Plan",
-                "narration_template": "Successful implementation requires a systematic approach. Let's outline the specific steps to achieve your objectives in {topic}.",
-                "duration": 50
-            },
-            {
-                "type": "conclusion",
-                "template": "Thank You\nNext Steps & Discussion",
-                "narration_template": "Thank you for your attention. Let's discuss how we can implement these strategies for your business success.",
-                "duration": 40
-            }
-        ],
-        "total_duration": 300,
-        "style": "corporate_professional",
-        "voice_style": "newscast"
-    }
-    
-    # Tech showcase template
-    tech_template = {
-        "name": "Technology Innovation Showcase",
-        "description": "Energetic tech presentation with enthusiastic narration",
-        "voice_persona": "enthusiastic",
-        "template_type": "tech_showcase",
-        "scenes": [
-            {
-                "type": "title",
-                "template": "Technology Innovation\n{title}",
-                "narration_template": "Get ready to discover cutting-edge technology that's transforming {topic}. This is truly exciting!",
-                "duration": 40
-            },
-            {
-                "type": "innovation",
-                "template": "Innovation Spotlight\nBreaking New Ground",
-                "narration_template": "Innovation in {topic} is happening at breakneck speed. Let's explore the technologies that are reshaping entire industries.",
-                "duration": 50
-            },
-            {
-                "type": "applications",
-                "template": "Real-World Applications\nPractical Implementation",
-                "narration_template": "These aren't just concepts – they're real solutions being implemented right here in Chennai and around the world.",
-                "duration": 55
-            },
-            {
-                "type": "benefits",
-                "template": "Transformative Benefits\nMeasurable Impact",
-                "narration_template": "The benefits are remarkable! Companies implementing these {topic} solutions see dramatic improvements in efficiency and results.",
-                "duration": 50
-            },
-            {
-                "type": "future",
-                "template": "Future Possibilities\nWhat's Next",
-                "narration_template": "The future is here, and it's powered by innovation in {topic}. Let's harness this technology for remarkable results.",
-                "duration": 45
-            }
-        ],
-        "total_duration": 240,
-        "style": "tech_modern",
-        "voice_style": "cheerful"
-    }
-    
-    # Financial education template
-    finance_template = {
-        "name": "Financial Education Series",
-        "description": "Authoritative financial education with expert narration",
-        "voice_persona": "authoritative",
-        "template_type": "financial_education",
-        "scenes": [
-            {
-                "type": "title",
-                "template": "Financial Education Series\n{title}",
-                "narration_template": "Welcome to our financial education series. Today we'll master the fundamentals of {topic}.",
-                "duration": 45
-            },
-            {
-                "type": "fundamentals",
-                "template": "Core Principles\nFoundational Knowledge",
-                "narration_template": "Understanding the core principles of {topic} is essential for making informed financial decisions.",
-                "duration": 60
-            },
-            {
-                "type": "strategies",
-                "template": "Proven Strategies\nExpert Approaches",
-                "narration_template": "Industry experts have developed proven strategies for {topic}. These approaches have been tested across global markets.",
-                "duration": 65
-            },
-            {
-                "type": "implementation",
-                "template": "Practical Implementation\nYour Action Plan",
-                "narration_template": "Remember, successful investing requires knowledge, patience, and disciplined execution. Start your journey today.",
-                "duration": 50
-            }
-        ],
-        "total_duration": 220,
-        "style": "finance_professional",
-        "voice_style": "newscast"
-    }
-    
     # Save templates
-    templates = {
-        "business_presentation": business_template,
-        "tech_showcase": tech_template,
-        "financial_education": finance_template
-    }
+    templates = VOICE_TEMPLATES
     
     templates_dir = Path("voice_templates")
     for template_name, template_data in templates.items():
         template_file = templates_dir / f"{template_name}.json"
-        with open(template_file, 'w', encoding='utf-8') as f:
-            json.dump(template_data, f, indent=2, ensure_ascii=False)
-        print(f"✅ Created template: {template_file}")
+        template_json = json.dumps(template_data, indent=2, ensure_ascii=False)
+        if write_if_changed(template_file, template_json.encode('utf-8')):
+            print(f"✅ Created template: {template_file}")
+        else:
+            print(f"✅ Up to date: {template_file}")
+        write_minified_json(template_file, template_data)
+    
+    # Primary load path: a generated module so callers can `from voice_templates import TEMPLATES`
+    # and Python caches the bytecode instead of re-parsing three JSON files every run.
+    # The JSON files above are kept for interop with non-Python tools.
+    templates_module = templates_dir / "__init__.py"
+    module_source = (
+        '"""Voice-enabled video templates (generated by setup_voice_enhanced_video_phase44.py)"""\n\n'
+        f"TEMPLATES = {pprint.pformat(templates, width=120, sort_dicts=False)}\n"
+    )
+    if write_if_changed(templates_module, module_source.encode('utf-8')):
+        py_compile.compile(str(templates_module), doraise=True)
+        print(f"✅ Created template module: {templates_module}")
+    else:
+        print(f"✅ Up to date: {templates_module}")
     
     print("✅ Voice-enabled templates created successfully!")
 
@@ -332,87 +526,19 @@ def create_test_scripts():
     """Create test scripts for voice integration"""
     print("\n🧪 Creating voice integration test scripts...")
     
-    # Test Azure Speech Service
-    test_speech_script = '''# test_azure_speech.py
-"""
-Test Azure Speech Service Integration
-"""
-import asyncio
-from azure_speech_service_v44 import AzureSpeechService
-
-async def test_speech_service():
-    print("🧪 Testing Azure Speech Service V4.4")
-    print("=" * 50)
-    
-    service = AzureSpeechService()
-    
-    # Test voice synthesis
-    test_text = "Welcome to Rudh's voice-enhanced video creation system with professional Indian English narration."
-    
-    result = await service.text_to_speech_with_persona(
-        test_text, 
-        persona="professional"
-    )
-    
-    if result['success']:
-        print(f"✅ Voice synthesis successful!")
-        print(f"📁 Audio file: {result['audio_file']}")
-        print(f"⏱️ Duration: {result['duration']:.2f}s")
-        print(f"🗣️ Voice: {result['voice']}")
-    else:
-        print(f"⚠️ Voice synthesis in fallback mode")
-    
-    return service
-
-if __name__ == "__main__":
-    asyncio.run(test_speech_service())
-'''
-    
-    # Test voice-enhanced video creation
-    test_video_script = '''# test_voice_enhanced_video.py
-"""
-Test Voice-Enhanced Video Creation
-"""
-import asyncio
-from enhanced_video_assistant_v44 import EnhancedVideoAssistantV44
-
-async def test_voice_video():
-    print("🧪 Testing Voice-Enhanced Video Creation V4.4")
-    print("=" * 60)
-    
-    assistant = EnhancedVideoAssistantV44()
-    
-    # Test video creation
-    result = await assistant.create_voice_enhanced_video(
-        topic="AI Portfolio Management for Chennai Businesses",
-        template="business_presentation",
-        persona="professional",
-        quality="presentation_quality"
-    )
-    
-    if result['success']:
-        print(f"✅ Voice-enhanced video creation successful!")
-        print(f"📁 Video: {result['video_file']}")
-        print(f"🗣️ Voice enabled: {result['voice_enabled']}")
-        print(f"📊 Scenes: {result['completed_scenes']}/{result['total_scenes']}")
-        print(f"⏱️ Total time: {result['total_duration']:.1f}s")
-    else:
-        print(f"❌ Video creation failed: {result.get('error')}")
-    
-    return assistant
-
-if __name__ == "__main__":
-    asyncio.run(test_voice_video())
-'''
-    
-    # Save test scripts
-    with open("test_azure_speech.py", 'w', encoding='utf-8') as f:
-        f.write(test_speech_script)
-    print("✅ Created: test_azure_speech.py")
+    # Copy test scripts and byte-compile them ahead of the first run
+    scripts = ["test_azure_speech.py", "test_voice_enhanced_video.py"]
     
-    with open("test_voice_enhanced_video.py", 'w', encoding='utf-8') as f:
-        f.write(test_video_script)
-    print("✅ Created: test_voice_enhanced_video.py")
+    for script_name in scripts:
+        if not copy_if_changed(TEMPLATES_DIR / f"{script_name}.template", script_name):
+            print(f"✅ Up to date: {script_name}")
+            continue
+        print(f"✅ Created: {script_name}")
+        
+        try:
+            py_compile.compile(script_name, doraise=True)
+        except py_compile.PyCompileError as e:
+            print(f"⚠️ {script_name}: Precompile failed - {e.msg}")
     
     print("✅ Test scripts created successfully!")
 
@@ -420,86 +546,10 @@ def create_azure_setup_guide():
     """Create Azure setup guide"""
     print("\n📋 Creating Azure Speech Service setup guide...")
     
-    setup_guide = """# Azure Speech Service Setup Guide for Rudh Voice Integration
-
-## Step 1: Create Azure Speech Service
-
-1. Go to Azure Portal (https://portal.azure.com)
-2. Click "Create a resource"
-3. Search for "Speech Services"
-4. Click "Create"
-
-## Step 2: Configuration
-
-**Subscription:** Your Azure subscription
-**Resource Group:** rg-rudh-core-dev-sea (same as OpenAI)
-**Region:** East US 2 (same as your OpenAI resource)
-**Name:** rudh-speech-eastus2
-**Pricing Tier:** Standard S0
-
-## Step 3: Get Credentials
-
-1. After deployment, go to your Speech resource
-2. Click "Keys and Endpoint"
-3. Copy Key 1 and Region
-
-## Step 4: Configure Environment
-
-Add to your .env file:
-```
-AZURE_SPEECH_KEY=your_speech_service_key_here
-AZURE_SPEECH_REGION=eastus2
-AZURE_SPEECH_VOICE=en-IN-NeerjaNeural
-```
-
-## Step 5: Add to Key Vault (Optional)
-
-If using Azure Key Vault:
-- Secret Name: rudh-speech-key, Value: [Key 1]
-- Secret Name: rudh-speech-region, Value: eastus2
-- Secret Name: rudh-speech-voice, Value: en-IN-NeerjaNeural
-
-## Available Voice Options
-
-### Indian English (Recommended)
-- **en-IN-NeerjaNeural** (Female, warm and friendly)
-- **en-IN-PrabhatNeural** (Male, professional)
-
-### Tamil (Cultural Authenticity)
-- **ta-IN-PallaviNeural** (Female)
-- **ta-IN-ValluvarNeural** (Male)
-
-## Cost Information
-
-- **Free Tier:** 5 hours per month
-- **Paid:** $4.50 per hour after free tier
-- **For personal use:** You'll likely stay within free tier
-
-## Testing Your Setup
-
-Run these commands to test:
-```bash
-python test_azure_speech.py
-python test_voice_enhanced_video.py
-```
-
-## Troubleshooting
-
-### Common Issues:
-1. **Authentication Error:** Check your Azure credentials
-2. **Region Mismatch:** Ensure region matches your resource
-3. **Audio Playback Issues:** Install pygame: `pip install pygame`
-4. **Import Errors:** Run setup script: `python setup_voice_enhanced_video_phase44.py`
-
-### Support:
-- Azure Speech Documentation: https://docs.microsoft.com/en-us/azure/cognitive-services/speech-service/
-- Rudh Project Repository: Your GitHub repository
-"""
-    
-    with open("AZURE_SPEECH_SETUP.md", 'w', encoding='utf-8') as f:
-        f.write(setup_guide)
-    
-    print("✅ Created: AZURE_SPEECH_SETUP.md")
+    if copy_if_changed(TEMPLATES_DIR / "AZURE_SPEECH_SETUP.md", "AZURE_SPEECH_SETUP.md"):
+        print("✅ Created: AZURE_SPEECH_SETUP.md")
+    else:
+        print("✅ Up to date: AZURE_SPEECH_SETUP.md")
 
 def display_next_steps():
     """Display next steps after setup"""
@@ -555,6 +605,7 @@ def main():
         create_voice_templates()
         create_test_scripts()
         create_azure_setup_guide()
+        save_setup_state()
         
         # Display completion message
         display_next_steps()
@@ -570,4 +621,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-"
\ No newline at end of file
@@ -4,16 +4,312 @@ Quick fix for Azure Speech Service - Use simple text instead of complex SSML
 """
 
 import asyncio
+import atexit
+import hashlib
+import json
 import os
 import sys
+import threading
+import time
+from pathlib import Path
+from xml.sax.saxutils import escape
 sys.path.append('src')
 
 from dotenv import load_dotenv
 import azure.cognitiveservices.speech as speechsdk
 
+# Optional: async file writes when the test is asked to persist audio
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
+from setup_voice_enhanced_video_phase44 import get_persona
+
 load_dotenv()
 
-async def test_simple_speech():
+# Module-level synthesizer shared by every test/call so the TLS + WebSocket
+# handshake to the Azure endpoint is only paid once per process.
+_synthesizer = None
+# Pre-opened connection for the synthesizer (kept referenced so it isn't garbage collected)
+_connection = None
+
+# Azure closes idle synthesis WebSockets after ~5 minutes
+KEEP_ALIVE_INTERVAL = 240
+
+def _build_synthesizer():
+    """Create a SpeechSynthesizer and pre-open its WebSocket connection"""
+    speech_config = speechsdk.SpeechConfig(
+        subscription=os.getenv('AZURE_SPEECH_KEY'),
+        region=os.getenv('AZURE_SPEECH_REGION', 'southeastasia')
+    )
+    speech_config.speech_synthesis_voice_name = os.getenv('AZURE_SPEECH_VOICE', 'en-IN-NeerjaNeural')
+    
+    # SIMPLE APPROACH: no audio output device, results stay in memory
+    synthesizer = speechsdk.SpeechSynthesizer(
+        speech_config=speech_config,
+        audio_config=None
+    )
+    
+    # Open the WebSocket now so the first synthesis doesn't pay the TLS handshake
+    connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+    connection.open(True)
+    
+    return synthesizer, connection
+
+def _get_synthesizer(rebuild: bool = False):
+    """Return the cached SpeechSynthesizer, creating it on first use"""
+    global _synthesizer, _connection
+    
+    if _synthesizer is None or rebuild:
+        _synthesizer, _connection = _build_synthesizer()
+    
+    return _synthesizer
+
+# Pool of synthesizers for concurrent requests - a single synthesizer holds its
+# WebSocket until each synthesis completes, which serializes callers. Every pooled
+# synthesizer keeps its own connection and counts against the Speech resource's
+# concurrent request quota (the free F0 tier is very limited), so keep this small.
+TTS_POOL_SIZE = int(os.getenv('RUDH_TTS_POOL_SIZE', '2'))
+_pool = None
+_pool_connections = {}
+# Serializes the first fill so concurrent first callers don't each build a pool
+_POOL_LOCK = asyncio.Lock()
+
+async def _get_pool() -> asyncio.Queue:
+    """Return the synthesizer pool, filling it with warmed synthesizers on first use"""
+    global _pool
+    
+    if _pool is not None:
+        return _pool
+    
+    async with _POOL_LOCK:
+        if _pool is None:
+            # connection.open(True) is a blocking TLS handshake, so build on worker threads
+            built = await asyncio.gather(*(
+                asyncio.to_thread(_build_synthesizer) for _ in range(TTS_POOL_SIZE)
+            ))
+            pool = asyncio.Queue()
+            for synthesizer, connection in built:
+                _pool_connections[id(synthesizer)] = connection
+                pool.put_nowait(synthesizer)
+            _pool = pool
+    
+    return _pool
+
+async def keep_alive(interval: float = KEEP_ALIVE_INTERVAL):
+    """Keep the cached synthesizer's connection warm in long-lived processes"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            synthesizer = _get_synthesizer()
+            await _await_result(synthesizer.speak_text_async(" "))
+        except Exception as e:
+            print(f"⚠️ Speech keep-alive failed: {e}")
+
+def start_keep_alive(interval: float = KEEP_ALIVE_INTERVAL) -> asyncio.Task:
+    """Schedule the keep-alive loop on the running event loop"""
+    return asyncio.create_task(keep_alive(interval))
+
+def _is_auth_failure(result) -> bool:
+    """Check whether a synthesis result was canceled because of expired/invalid auth"""
+    if result.reason != speechsdk.ResultReason.Canceled:
+        return False
+    cancellation_details = speechsdk.CancellationDetails(result)
+    return cancellation_details.error_code == speechsdk.CancellationErrorCode.AuthenticationFailure
+
+async def _await_result(future):
+    """Await an SDK ResultFuture on a worker thread instead of blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, future.get)
+
+async def _run_with_reauth(start):
+    """Run start(synthesizer) on the cached synthesizer, rebuilding it once on auth failure"""
+    result = await _await_result(start(_get_synthesizer()))
+    
+    if _is_auth_failure(result):
+        # Token expired on the long-lived connection - rebuild and retry once
+        result = await _await_result(start(_get_synthesizer(rebuild=True)))
+    
+    return result
+
+async def _speak(text: str, ssml: bool = False):
+    """Synthesize the full utterance with the cached synthesizer"""
+    if ssml:
+        return await _run_with_reauth(lambda synthesizer: synthesizer.speak_ssml_async(text))
+    return await _run_with_reauth(lambda synthesizer: synthesizer.speak_text_async(text))
+
+async def synthesize(text: str, ssml: bool = False):
+    """Synthesize on a pooled synthesizer so concurrent requests run in parallel"""
+    pool = await _get_pool()
+    synthesizer = await pool.get()
+    
+    try:
+        speak = synthesizer.speak_ssml_async if ssml else synthesizer.speak_text_async
+        result = await _await_result(speak(text))
+        
+        if _is_auth_failure(result):
+            # Replace the expired pool member and retry once
+            _pool_connections.pop(id(synthesizer), None)
+            synthesizer, connection = await asyncio.to_thread(_build_synthesizer)
+            _pool_connections[id(synthesizer)] = connection
+            speak = synthesizer.speak_ssml_async if ssml else synthesizer.speak_text_async
+            result = await _await_result(speak(text))
+        
+        return result
+    finally:
+        pool.put_nowait(synthesizer)
+
+async def stream_speech(text: str, chunk_size: int = 16000):
+    """Yield audio chunks as soon as synthesis starts instead of waiting for completion"""
+    # start_speaking_* returns once the first audio is available, not when synthesis finishes
+    result = await _run_with_reauth(lambda synthesizer: synthesizer.start_speaking_text_async(text))
+    
+    if result.reason == speechsdk.ResultReason.Canceled:
+        cancellation_details = speechsdk.CancellationDetails(result)
+        raise RuntimeError(f"Synthesis canceled: {cancellation_details.error_details}")
+    
+    stream = speechsdk.AudioDataStream(result)
+    buffer = bytes(chunk_size)
+    
+    # read_data blocks until the next chunk arrives, so run it off the event loop
+    filled = await asyncio.to_thread(stream.read_data, buffer)
+    while filled > 0:
+        yield buffer[:filled]
+        filled = await asyncio.to_thread(stream.read_data, buffer)
+    
+    if stream.status == speechsdk.StreamStatus.Canceled:
+        raise RuntimeError("Synthesis canceled while streaming audio")
+
+# Content-addressed cache for synthesized audio, shared with the Phase 4.4 setup layout
+SPEECH_CACHE_DIR = Path("speech_cache")
+SPEECH_CACHE_MAX_ENTRIES = 200
+_CACHE_MANIFEST = SPEECH_CACHE_DIR / "manifest.json"
+# Cache hits only touch the in-memory manifest; it is written out every this many changes
+MANIFEST_FLUSH_EVERY = 20
+
+# In-memory manifest ({key: last access time}), loaded on first use and guarded by _MANIFEST_LOCK
+_manifest = None
+_manifest_changes = 0
+_MANIFEST_LOCK = threading.Lock()
+
+def _load_persona(persona: str) -> dict:
+    """Get persona voice settings from voice_config.json, falling back to the env voice"""
+    try:
+        return get_persona(persona)
+    except (OSError, KeyError):
+        pass
+    
+    return {
+        "voice": os.getenv('AZURE_SPEECH_VOICE', 'en-IN-NeerjaNeural'),
+        "style": "friendly",
+        "rate": "0%",
+        "pitch": "0%"
+    }
+
+def _cache_key(text: str, voice: str, style: str, rate: str, pitch: str) -> str:
+    """SHA-256 key over the normalized text and every setting that changes the audio"""
+    normalized_text = " ".join(text.split())
+    return hashlib.sha256(f"{normalized_text}|{voice}|{style}|{rate}|{pitch}".encode('utf-8')).hexdigest()
+
+def _read_manifest() -> dict:
+    """Read the cache manifest ({key: last access time})"""
+    try:
+        with open(_CACHE_MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _record_access(key: str) -> bool:
+    """Note a cache access in the in-memory manifest; True when a write-out is due"""
+    global _manifest, _manifest_changes
+    with _MANIFEST_LOCK:
+        if _manifest is None:
+            _manifest = _read_manifest()
+        _manifest[key] = time.time()
+        _manifest_changes += 1
+        return _manifest_changes >= MANIFEST_FLUSH_EVERY
+
+def flush_manifest():
+    """Evict least recently used entries over the limit and atomically replace manifest.json (blocking)"""
+    global _manifest_changes
+    with _MANIFEST_LOCK:
+        if not _manifest_changes:
+            return
+        evicted = []
+        while len(_manifest) > SPEECH_CACHE_MAX_ENTRIES:
+            oldest = min(_manifest, key=_manifest.get)
+            evicted.append(oldest)
+            del _manifest[oldest]
+        snapshot = json.dumps(_manifest)
+        _manifest_changes = 0
+    
+    for key in evicted:
+        (SPEECH_CACHE_DIR / f"{key}.wav").unlink(missing_ok=True)
+    
+    _write_atomic(_CACHE_MANIFEST, snapshot.encode('utf-8'))
+
+def _write_atomic(path: Path, data: bytes):
+    """Write via a temp file in the same directory so readers never see a partial file (blocking)"""
+    # Concurrent writers each use their own temp file; os.replace swaps it in whole
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+# Accesses since the last write-out are kept when the process exits
+atexit.register(flush_manifest)
+
+def _build_persona_ssml(text: str, voice: str, style: str, rate: str, pitch: str) -> str:
+    """Build SSML for a persona (voice, speaking style and prosody)"""
+    return (
+        '<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" '
+        'xmlns:mstts="https://www.w3.org/2001/mstts" xml:lang="en-IN">'
+        f'<voice name="{voice}"><mstts:express-as style="{style}">'
+        f'<prosody rate="{rate}" pitch="{pitch}">{escape(text)}</prosody>'
+        '</mstts:express-as></voice></speak>'
+    )
+
+async def tts(text: str, persona: str = "friendly") -> bytes:
+    """Synthesize text for a persona, serving repeated requests from speech_cache/"""
+    settings = _load_persona(persona)
+    voice = settings.get("voice", os.getenv('AZURE_SPEECH_VOICE', 'en-IN-NeerjaNeural'))
+    style = settings.get("style", "friendly")
+    rate = settings.get("rate", "0%")
+    pitch = settings.get("pitch", "0%")
+    
+    key = _cache_key(text, voice, style, rate, pitch)
+    path = SPEECH_CACHE_DIR / f"{key}.wav"
+    
+    try:
+        audio = await asyncio.to_thread(path.read_bytes)
+    except FileNotFoundError:
+        result = await _speak(_build_persona_ssml(text, voice, style, rate, pitch), ssml=True)
+        if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+            raise RuntimeError(f"Speech synthesis failed: {result.reason}")
+        
+        audio = result.audio_data
+        SPEECH_CACHE_DIR.mkdir(exist_ok=True)
+        await asyncio.to_thread(_write_atomic, path, audio)
+    
+    # The first access loads manifest.json, so keep it off the event loop too
+    if await asyncio.to_thread(_record_access, key):
+        await asyncio.to_thread(flush_manifest)
+    
+    return audio
+
+async def _save_audio(path: str, audio: bytes):
+    """Persist audio without blocking the event loop"""
+    if AIOFILES_AVAILABLE:
+        async with aiofiles.open(path, 'wb') as f:
+            await f.write(audio)
+    else:
+        await asyncio.to_thread(Path(path).write_bytes, audio)
+
+async def test_simple_speech(save_path: str = None):
     """Test with simple text synthesis (no SSML)"""
     print("🔧 TESTING SIMPLE SPEECH SYNTHESIS")
     print("=" * 50)
@@ -31,36 +327,27 @@ async def test_simple_speech():
         return
     
     try:
-        # Create speech config
-        speech_config = speechsdk.SpeechConfig(
-            subscription=speech_key,
-            region=speech_region
-        )
-        speech_config.speech_synthesis_voice_name = speech_voice
-        
-        # SIMPLE APPROACH: Use default audio output
-        synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=speech_config,
-            audio_config=None  # Let Azure SDK handle audio output automatically
-        )
-        
         print(f"\n🎵 Testing simple text synthesis...")
         
         # Test simple text (NO SSML)
         test_text = "Hello! I'm Rudh, your AI companion. How are you feeling today?"
         
-        result = synthesizer.speak_text_async(test_text).get()
+        # Stream the audio into memory as chunks arrive; only touch disk if asked to
+        audio = bytearray()
+        async for chunk in stream_speech(test_text):
+            audio += chunk
         
-        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+        if save_path and audio:
+            await _save_audio(save_path, bytes(audio))
+            print(f"   Saved audio: {save_path}")
+        
+        if len(audio) > 0:
             print(f"✅ SUCCESS! Simple text synthesis working!")
-            print(f"   Audio size: {len(result.audio_data)} bytes")
+            print(f"   Audio size: {len(audio)} bytes")
             print(f"   Voice: {speech_voice}")
             return True
         else:
-            print(f"❌ FAILED: {result.reason}")
-            if result.reason == speechsdk.ResultReason.Canceled:
-                cancellation_details = speechsdk.CancellationDetails(result)
-                print(f"   Error: {cancellation_details.error_details}")
+            print(f"❌ FAILED: no audio received")
             return False
             
     except Exception as e:
@@ -72,16 +359,9 @@ async def test_basic_ssml():
     print(f"\n🧪 TESTING BASIC SSML")
     print("=" * 30)
     
-    speech_key = os.getenv('AZURE_SPEECH_KEY')
-    speech_region = os.getenv('AZURE_SPEECH_REGION', 'southeastasia')
     speech_voice = os.getenv('AZURE_SPEECH_VOICE', 'en-IN-NeerjaNeural')
     
     try:
-        speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=speech_region)
-        speech_config.speech_synthesis_voice_name = speech_voice
-        
-        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config)
-        
         # Very basic SSML - just voice selection
         basic_ssml = f'''
         <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="en-IN">
@@ -91,7 +371,7 @@ async def test_basic_ssml():
         </speak>
         '''
         
-        result = synthesizer.speak_ssml_async(basic_ssml).get()
+        result = await _speak(basic_ssml, ssml=True)
         
         if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
             print(f"✅ Basic SSML works!")
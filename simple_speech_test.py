@@ -3,99 +3,319 @@
 Simple test for Azure Speech Service to identify the exact issue
 """
 
+import asyncio
+import dataclasses
 import os
+import random
+import string
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import cache, lru_cache
+from xml.sax.saxutils import escape
+from anyio import CapacityLimiter, to_thread
 from dotenv import load_dotenv
 import azure.cognitiveservices.speech as speechsdk
 
 # Load environment variables
 load_dotenv()
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class SpeechEnv:
+    """Speech settings read from the environment once at import"""
+    key: str
+    region: str
+    voice: str
+
+_ENV = SpeechEnv(
+    key=os.getenv('AZURE_SPEECH_KEY', ''),
+    region=os.getenv('AZURE_SPEECH_REGION', 'southeastasia'),
+    voice=os.getenv('AZURE_SPEECH_VOICE', 'en-IN-NeerjaNeural')
+)
+
+SSML_TEMPLATE = string.Template(
+    "<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='en-US'>"
+    "<voice name='$voice'><prosody rate='$rate' pitch='$pitch'>$text</prosody></voice></speak>"
+)
+
+@lru_cache(maxsize=64)
+def _build_ssml(voice, text, rate="0%", pitch="0Hz"):
+    """Fill the SSML template (cached, since the probe texts repeat)"""
+    return SSML_TEMPLATE.substitute(voice=voice, rate=rate, pitch=pitch, text=escape(text))
+
+# Report lines are buffered and written once per phase instead of one write per line
+_LOG_LINES = []
+
+def _log(line=""):
+    """Buffer one line of the test report"""
+    _LOG_LINES.append(line)
+
+def _flush_log():
+    """Write all buffered report lines in a single call"""
+    if _LOG_LINES:
+        sys.stdout.write("\n".join(_LOG_LINES) + "\n")
+        sys.stdout.flush()
+        _LOG_LINES.clear()
+
+# At most this many probe threads block on the SDK at once (one per open websocket)
+_SYNTH_LIMITER = CapacityLimiter(int(os.getenv("RUDH_SYNTH_CONCURRENCY", "4")))
+
+# Pre-warmed synthesizers are shared per region so voice swaps skip the TLS+WS handshake
+_POOLS = {}
+
+# Guards the shared SpeechConfig while a voice is set and a synthesizer built from it
+_CONFIG_LOCK = threading.Lock()
+
+@cache
+def _get_speech_config(key, region):
+    """One SpeechConfig per key/region; only the voice name changes between synthesizers"""
+    return speechsdk.SpeechConfig(subscription=key, region=region)
+
+def _build_synth(region, voice, key):
+    """Create a synthesizer for one voice and pre-open its websocket"""
+    speech_config = _get_speech_config(key, region)
+    with _CONFIG_LOCK:
+        speech_config.speech_synthesis_voice_name = voice
+        synth = speechsdk.SpeechSynthesizer(
+            speech_config=speech_config,
+            audio_config=speechsdk.audio.AudioOutputConfig(use_default_speaker=True)
+        )
+    conn = speechsdk.Connection.from_speech_synthesizer(synth)
+    conn.open(False)
+    return synth, conn
+
+class SynthesizerPool:
+    """Idle (synthesizer, connection) pairs per voice with jittered expiry"""
+
+    def __init__(self, region, key, voices=(), num_prewarm=3):
+        self.region = region
+        self.key = key
+        self._idle = {}
+        self._discarded = set()
+        for voice in list(voices)[:num_prewarm]:
+            self.prewarm(voice)
+
+    @staticmethod
+    def _expiry():
+        # Spread reconnects out so pooled connections don't all expire together
+        return time.time() + random.uniform(300, 600)
+
+    def prewarm(self, voice):
+        """Ensure at least one open synthesizer is idle for this voice"""
+        idle = self._idle.setdefault(voice, deque())
+        if not idle:
+            synth, conn = _build_synth(self.region, voice, self.key)
+            idle.append((synth, conn, self._expiry()))
+
+    def _checkout(self, voice):
+        idle = self._idle.setdefault(voice, deque())
+        now = time.time()
+        while idle:
+            synth, conn, expires_at = idle.popleft()
+            if expires_at > now:
+                return synth, conn, expires_at
+            conn.close()
+        synth, conn = _build_synth(self.region, voice, self.key)
+        return synth, conn, self._expiry()
+
+    @contextmanager
+    def acquire(self, voice):
+        """Borrow a synthesizer for voice, returning it to the pool afterwards"""
+        entry = self._checkout(voice)
+        try:
+            yield entry[0]
+        finally:
+            self.release(voice, entry)
+
+    def release(self, voice, entry):
+        """Return a borrowed entry unless it was discarded while checked out"""
+        synth, conn, _ = entry
+        if id(synth) in self._discarded:
+            self._discarded.discard(id(synth))
+            conn.close()
+        else:
+            self._idle.setdefault(voice, deque()).append(entry)
+
+    def discard(self, synth):
+        """Drop a borrowed synthesizer (e.g. after its key was rejected) on release"""
+        self._discarded.add(id(synth))
+
+    def rekey(self, key):
+        """Switch to a new key, closing idle synthesizers built with the old one"""
+        self.key = key
+        for idle in self._idle.values():
+            while idle:
+                idle.popleft()[1].close()
+
+def _get_pool(region, key, voices=()):
+    """Return the shared pool for this region, creating and pre-warming it on first use"""
+    pool = _POOLS.get(region)
+    if pool is None or pool.key != key:
+        pool = _POOLS[region] = SynthesizerPool(region, key, voices)
+    return pool
+
+# Cancellations worth retrying; anything else (e.g. AuthenticationFailure) is reported as-is
+_TRANSIENT_ERRORS = frozenset({
+    speechsdk.CancellationErrorCode.ServiceTimeout,
+    speechsdk.CancellationErrorCode.ServiceUnavailable,
+    speechsdk.CancellationErrorCode.ConnectionFailure,
+})
+
+def _synthesize_with_retry(synth, text, n_max=3, d_base=1.0, jitter=0.5, streaming=False, ssml=False):
+    """Run synthesis, retrying transient service errors with exponential backoff and jitter"""
+    if ssml:
+        speak = synth.start_speaking_ssml_async if streaming else synth.speak_ssml_async
+    else:
+        speak = synth.start_speaking_text_async if streaming else synth.speak_text_async
+    for attempt in range(n_max):
+        result = speak(text).get()
+        if result.reason != speechsdk.ResultReason.Canceled:
+            return result
+        details = speechsdk.CancellationDetails(result)
+        if (details.reason != speechsdk.CancellationReason.Error
+                or details.error_code not in _TRANSIENT_ERRORS
+                or attempt == n_max - 1):
+            return result
+        delay = min(d_base * 2 ** attempt * (1 + random.random() * jitter), 30.0)
+        _log(f"   ⏳ {details.error_code} - retrying in {delay:.1f}s")
+        time.sleep(delay)
+    return result
+
+def _reload_speech_key():
+    """Re-read the key from the environment and forget SpeechConfigs built with the old one"""
+    load_dotenv(override=True)
+    _get_speech_config.cache_clear()
+    return os.getenv('AZURE_SPEECH_KEY', '')
+
+def _speak_pooled(pool, voice, text):
+    """Speak with a pooled synthesizer, retrying once if the key was rejected and has since changed"""
+    for attempt in range(2):
+        used_key = pool.key
+        with pool.acquire(voice) as synth:
+            result = _synthesize_with_retry(synth, _build_ssml(voice, text), ssml=True)
+            if result.reason != speechsdk.ResultReason.Canceled:
+                return result
+            details = speechsdk.CancellationDetails(result)
+            if details.error_code != speechsdk.CancellationErrorCode.AuthenticationFailure:
+                return result
+            pool.discard(synth)
+        key = _reload_speech_key()
+        if attempt or not key or key == used_key:
+            # Same key would fail the same way; report the rejection instead
+            return result
+        if key != pool.key:
+            pool.rekey(key)
+    return result
+
+def _stream_pooled(pool, voice, text, chunk_size=16000):
+    """Stream synthesis from a pooled synthesizer, returning (reason, cancellation, bytes, ttfb)"""
+    with pool.acquire(voice) as synth:
+        started = time.perf_counter()
+        # Plain text, so the basic test exercises nothing but the key, region and voice;
+        # .get() returns once synthesis starts, not when the whole clip is done
+        result = _synthesize_with_retry(synth, text, streaming=True)
+        if result.reason == speechsdk.ResultReason.Canceled:
+            details = speechsdk.CancellationDetails(result)
+            if details.error_code == speechsdk.CancellationErrorCode.AuthenticationFailure:
+                pool.discard(synth)
+            return result.reason, details, 0, None
+        
+        stream = speechsdk.AudioDataStream(result)
+        buf = bytes(chunk_size)
+        ttfb = None
+        audio_bytes = 0
+        n = stream.read_data(buf)
+        while n > 0:
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+            audio_bytes += n
+            n = stream.read_data(buf)
+        
+        if stream.status == speechsdk.StreamStatus.Canceled:
+            return speechsdk.ResultReason.Canceled, stream.cancellation_details, audio_bytes, ttfb
+        return speechsdk.ResultReason.SynthesizingAudioCompleted, None, audio_bytes, ttfb
+
 def test_speech_service():
     """Test speech service with detailed error reporting"""
-    print("🧪 TESTING AZURE SPEECH SERVICE")
-    print("=" * 50)
+    _log("🧪 TESTING AZURE SPEECH SERVICE")
+    _log("=" * 50)
     
     # Get credentials
-    speech_key = os.getenv('AZURE_SPEECH_KEY')
-    speech_region = os.getenv('AZURE_SPEECH_REGION', 'southeastasia')
-    speech_voice = os.getenv('AZURE_SPEECH_VOICE', 'en-IN-NeerjaNeural')
+    speech_key = _ENV.key
+    speech_region = _ENV.region
+    speech_voice = _ENV.voice
     
-    print(f"📋 Configuration:")
-    print(f"   Region: {speech_region}")
-    print(f"   Voice: {speech_voice}")
-    print(f"   Key Present: {'✅' if speech_key else '❌'}")
+    _log(f"📋 Configuration:")
+    _log(f"   Region: {speech_region}")
+    _log(f"   Voice: {speech_voice}")
+    _log(f"   Key Present: {'✅' if speech_key else '❌'}")
     
     if not speech_key:
-        print("❌ AZURE_SPEECH_KEY not found in .env file")
+        _log("❌ AZURE_SPEECH_KEY not found in .env file")
         return False
     
     try:
-        # Create speech config
-        speech_config = speechsdk.SpeechConfig(
-            subscription=speech_key,
-            region=speech_region
-        )
-        
-        # Set voice
-        speech_config.speech_synthesis_voice_name = speech_voice
+        _log(f"\n🔧 Creating synthesizer...")
         
-        print(f"\n🔧 Creating synthesizer...")
+        # Pooled per region with the connection opened up front
+        pool = _get_pool(speech_region, speech_key)
+        pool.prewarm(speech_voice)
         
-        # Create synthesizer with null audio config (don't play, just generate)
-        audio_config = speechsdk.audio.AudioOutputConfig(use_default_speaker=True)
-        synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=speech_config, 
-            audio_config=audio_config
-        )
-        
-        print(f"✅ Synthesizer created successfully")
+        _log(f"✅ Synthesizer created successfully")
         
         # Test simple synthesis
         test_text = "Hello from Rudh. This is a speech test."
-        print(f"\n🎵 Testing synthesis: '{test_text}'")
+        _log(f"\n🎵 Testing synthesis: '{test_text}'")
         
-        result = synthesizer.speak_text_async(test_text).get()
+        reason, cancellation_details, audio_bytes, ttfb = _stream_pooled(pool, speech_voice, test_text)
         
         # Check result
-        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-            print(f"✅ SUCCESS! Speech synthesis working!")
-            print(f"   Audio generated: {len(result.audio_data)} bytes")
-            print(f"   Voice used: {speech_voice}")
-            print(f"   Region used: {speech_region}")
+        if reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            _log(f"✅ SUCCESS! Speech synthesis working!")
+            if ttfb is not None:
+                _log(f"   First audio chunk: {ttfb * 1000:.0f} ms")
+            _log(f"   Audio generated: {audio_bytes} bytes")
+            _log(f"   Voice used: {speech_voice}")
+            _log(f"   Region used: {speech_region}")
             return True
             
-        elif result.reason == speechsdk.ResultReason.Canceled:
-            print(f"❌ SYNTHESIS CANCELED")
-            cancellation_details = speechsdk.CancellationDetails(result)
-            print(f"   Reason: {cancellation_details.reason}")
-            print(f"   Error Code: {cancellation_details.error_code}")
+        elif reason == speechsdk.ResultReason.Canceled:
+            _log(f"❌ SYNTHESIS CANCELED")
+            _log(f"   Reason: {cancellation_details.reason}")
+            _log(f"   Error Code: {cancellation_details.error_code}")
             if cancellation_details.error_details:
-                print(f"   Error Details: {cancellation_details.error_details}")
+                _log(f"   Error Details: {cancellation_details.error_details}")
             
             # Common error solutions
-            print(f"\n💡 POTENTIAL SOLUTIONS:")
+            _log(f"\n💡 POTENTIAL SOLUTIONS:")
             if "authentication" in str(cancellation_details.error_details).lower():
-                print("   🔑 Check your speech service key in Azure Portal")
-                print("   🔄 Regenerate the key if needed")
+                _log("   🔑 Check your speech service key in Azure Portal")
+                _log("   🔄 Regenerate the key if needed")
             elif "region" in str(cancellation_details.error_details).lower():
-                print("   🌏 Verify speech service region in Azure Portal")
-                print("   📍 Current region setting: southeastasia")
+                _log("   🌏 Verify speech service region in Azure Portal")
+                _log("   📍 Current region setting: southeastasia")
             elif "voice" in str(cancellation_details.error_details).lower():
-                print("   🗣️ Try a different voice: en-US-AriaNeural")
+                _log("   🗣️ Try a different voice: en-US-AriaNeural")
             
             return False
         else:
-            print(f"❌ UNEXPECTED RESULT: {result.reason}")
+            _log(f"❌ UNEXPECTED RESULT: {reason}")
             return False
             
     except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
+        _log(f"❌ EXCEPTION: {e}")
         return False
 
 def test_alternative_voices():
     """Test with alternative voices if main one fails"""
-    print(f"\n🧪 TESTING ALTERNATIVE VOICES")
-    print("=" * 30)
+    asyncio.run(_probe_alternative_voices())
+
+async def _probe_alternative_voices():
+    """Probe every alternative voice concurrently"""
+    _log(f"\n🧪 TESTING ALTERNATIVE VOICES")
+    _log("=" * 30)
     
     alternative_voices = [
         "en-US-AriaNeural",
@@ -104,43 +324,42 @@ def test_alternative_voices():
         "en-IN-PrabhatNeural"  # Male Indian voice
     ]
     
-    speech_key = os.getenv('AZURE_SPEECH_KEY')
-    speech_region = os.getenv('AZURE_SPEECH_REGION', 'southeastasia')
+    speech_key = _ENV.key
+    speech_region = _ENV.region
     
     if not speech_key:
         return
     
-    for voice in alternative_voices:
-        print(f"\n🎵 Testing voice: {voice}")
-        
-        try:
-            speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=speech_region)
-            speech_config.speech_synthesis_voice_name = voice
-            
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=speech_config,
-                audio_config=speechsdk.audio.AudioOutputConfig(use_default_speaker=True)
-            )
-            
-            result = synthesizer.speak_text_async("Test voice").get()
-            
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                print(f"✅ {voice} works! ({len(result.audio_data)} bytes)")
-            else:
-                print(f"❌ {voice} failed")
-                
-        except Exception as e:
-            print(f"❌ {voice} error: {e}")
+    pool = _get_pool(speech_region, speech_key)
+    
+    async def _probe(voice):
+        # The SDK calls block, so each voice runs in its own worker thread
+        await to_thread.run_sync(pool.prewarm, voice, limiter=_SYNTH_LIMITER)
+        return await to_thread.run_sync(_speak_pooled, pool, voice, "Test voice", limiter=_SYNTH_LIMITER)
+    
+    _log(f"\n🎵 Testing voices: {', '.join(alternative_voices)}")
+    results = await asyncio.gather(*[_probe(v) for v in alternative_voices], return_exceptions=True)
+    
+    for voice, result in zip(alternative_voices, results):
+        if isinstance(result, Exception):
+            _log(f"❌ {voice} error: {result}")
+        elif result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            _log(f"✅ {voice} works! ({len(result.audio_data)} bytes)")
+        else:
+            _log(f"❌ {voice} failed")
 
 if __name__ == "__main__":
     success = test_speech_service()
+    _flush_log()
     
     if not success:
         test_alternative_voices()
+        _flush_log()
         
-    print(f"\n🎯 SUMMARY:")
+    _log(f"\n🎯 SUMMARY:")
     if success:
-        print("✅ Speech service working - check your main app configuration")
+        _log("✅ Speech service working - check your main app configuration")
     else:
-        print("❌ Speech service needs attention - check key and region")
-        print("💡 Verify in Azure Portal: speech-rudh-core-dev-sea service")
\ No newline at end of file
+        _log("❌ Speech service needs attention - check key and region")
+        _log("💡 Verify in Azure Portal: speech-rudh-core-dev-sea service")
+    _flush_log()
@@ -2,30 +2,129 @@
 FastAPI application for Rudh AI Companion
 Provides REST API endpoints to interact with Rudh
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from cachetools import TTLCache
 import asyncio
+import hashlib
 import logging
-import sys
+import re
 import os
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
+from rudh_core import __version__
 from rudh_core.core import RudhCore
 from config.config import RudhConfig
+from azure_integration.azure_services import SynthesizerPool, SPEECH_SDK_AVAILABLE
+
+if SPEECH_SDK_AVAILABLE:
+    import azure.cognitiveservices.speech as speechsdk
+
+# Caps concurrent process_message calls from /chat/batch to protect downstream services
+BATCH_CONCURRENCY = asyncio.Semaphore(16)
+MAX_BATCH_MESSAGES = 32
+
+# Repeated replies skip TTS (keyed by voice + text); chat itself is never cached since
+# every message updates the user's history, learning and stats
+AUDIO_CACHE_TTL = 300
+AUDIO_CACHE: TTLCache = TTLCache(maxsize=256, ttl=AUDIO_CACHE_TTL)
+CACHE_LOCK = asyncio.Lock()
+
+# Sentence boundaries for streaming synthesis (punctuation stays with its sentence)
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+async def _open_synth_pool(speech_config: Dict) -> Optional[SynthesizerPool]:
+    """Pre-warm the shared synthesizer pool, or return None if speech is unavailable"""
+    if not (SPEECH_SDK_AVAILABLE and speech_config.get("key")):
+        logging.info("Speech not configured - synthesizer pool disabled")
+        return None
+    
+    try:
+        pool = SynthesizerPool.from_key(
+            speech_config["key"],
+            speech_config["region"],
+            speech_config["voice"],
+            size=int(os.getenv("RUDH_SYNTH_POOL", "4")),
+            output_format=speechsdk.SpeechSynthesisOutputFormat.Audio24Khz48KBitRateMonoMp3
+        )
+        await pool.open()
+        return pool
+    except Exception as e:
+        logging.warning(f"⚠️ Synthesizer pool unavailable: {e}")
+        return None
+
+async def _initialize_rudh(app: FastAPI, rudh: RudhCore, config: Dict):
+    """Open the synthesizer pool and warm up Rudh without holding up the event loop"""
+    app.state.synth_pool = await _open_synth_pool(config["azure"]["speech"])
+    
+    try:
+        # Initialize Rudh
+        success = await rudh.initialize()
+        
+        if success:
+            logging.info("✅ Rudh AI Companion API started successfully!")
+        else:
+            logging.warning("⚠️ Rudh started with limited functionality")
+            
+    except Exception as e:
+        logging.error(f"❌ Failed to start Rudh: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create Rudh up front and warm it up in the background, so /health answers degraded meanwhile"""
+    logging.info("🚀 Starting Rudh AI Companion API...")
+    
+    config = RudhConfig.get_config()
+    app.state.synth_pool = None
+    try:
+        app.state.rudh = RudhCore(config)
+    except Exception as e:
+        logging.error(f"❌ Failed to create Rudh: {e}")
+        app.state.rudh = None
+    
+    startup_task = None
+    if app.state.rudh:
+        startup_task = asyncio.create_task(_initialize_rudh(app, app.state.rudh, config))
+    
+    yield
+    
+    if startup_task and not startup_task.done():
+        startup_task.cancel()
+    if app.state.synth_pool:
+        app.state.synth_pool.close()
+
+class GZipExceptAudioMiddleware:
+    """GZip JSON responses but pass audio routes through untouched (MP3 is already compressed)"""
+    
+    def __init__(self, app, audio_paths=("/chat/stream",), **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.audio_paths = frozenset(audio_paths)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.audio_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Rudh AI Companion API",
     description="Advanced AI Companion with Emotional Intelligence",
-    version="0.1.0",
+    version=__version__,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Compress JSON payloads large enough to benefit (history, stats, batch replies)
+app.add_middleware(GZipExceptAudioMiddleware, minimum_size=1024, compresslevel=6)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -35,56 +134,80 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global Rudh instance
-rudh_instance: Optional[RudhCore] = None
-
 # Pydantic models for API
 class MessageRequest(BaseModel):
     message: str
     user_id: Optional[str] = "default"
     context: Optional[Dict] = None
 
+class EmotionDetected(BaseModel):
+    primary_emotion: str = "neutral"
+    confidence: float = 0.0
+    intensity: str = "medium"
+    secondary_emotions: List[str] = []
+    context_keywords: List[str] = []
+    timestamp: Optional[str] = None
+    processing_time: Optional[str] = None
+
+class StatsModel(BaseModel):
+    # Core stats vary by engine version, so unknown keys are passed through
+    model_config = ConfigDict(extra="allow")
+    
+    messages_processed: int = 0
+    total_processing_time: float = 0.0
+    average_confidence: float = 0.0
+
 class MessageResponse(BaseModel):
     response: str
-    emotion_detected: Dict
+    emotion_detected: EmotionDetected
     strategy_used: str
     timestamp: str
     confidence: float
     language_detected: str
     rudh_mood: str
 
+class BatchRequest(BaseModel):
+    messages: List[MessageRequest] = Field(max_length=MAX_BATCH_MESSAGES)
+
 class HealthResponse(BaseModel):
     status: str
     rudh_initialized: bool
-    stats: Dict
+    stats: StatsModel
 
 class ConversationHistoryResponse(BaseModel):
-    conversations: List[Dict]
+    conversations: List[Dict[str, Any]]
     total_count: int
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize Rudh on startup"""
-    global rudh_instance
-    
-    logging.info("🚀 Starting Rudh AI Companion API...")
-    
-    try:
-        config = RudhConfig.get_config()
-        rudh_instance = RudhCore(config)
-        
-        # Initialize Rudh
-        success = await rudh_instance.initialize()
-        
-        if success:
-            logging.info("✅ Rudh AI Companion API started successfully!")
-        else:
-            logging.warning("⚠️ Rudh started with limited functionality")
-            
-    except Exception as e:
-        logging.error(f"❌ Failed to start Rudh: {e}")
-        rudh_instance = None
+def _text_digest(text: str) -> bytes:
+    """Short BLAKE2b digest used in cache keys"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+async def _cache_get(cache: TTLCache, key):
+    async with CACHE_LOCK:
+        return cache.get(key)
+
+async def _cache_set(cache: TTLCache, key, value):
+    async with CACHE_LOCK:
+        cache[key] = value
+
+def _to_message_response(response: Dict) -> MessageResponse:
+    """Shape a process_message result into the API response model"""
+    return MessageResponse(
+        response=response["response"],
+        emotion_detected=response["emotion_detected"],
+        strategy_used=response.get("strategy_used", "unknown"),
+        timestamp=response["timestamp"],
+        confidence=response.get("confidence", 0.0),
+        language_detected=response.get("language_detected", "english"),
+        rudh_mood=response.get("rudh_mood", "neutral")
+    )
+
+def get_rudh(request: Request) -> RudhCore:
+    """Dependency returning the app's Rudh instance, or 503 while it is unavailable"""
+    rudh = request.app.state.rudh
+    if not rudh:
+        raise HTTPException(status_code=503, detail="Rudh not initialized")
+    return rudh
 
 # API Endpoints
 @app.get("/", response_model=Dict)
@@ -92,67 +215,105 @@ async def root():
     """Root endpoint with API information"""
     return {
         "message": "🤖 Rudh AI Companion API",
-        "version": "0.1.0",
+        "version": __version__,
         "status": "active",
         "docs": "/docs",
         "health": "/health"
     }
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(rudh: RudhCore = Depends(get_rudh)):
     """Health check endpoint"""
-    global rudh_instance
-    
-    if not rudh_instance:
-        raise HTTPException(status_code=503, detail="Rudh not initialized")
-    
-    stats = rudh_instance.get_stats()
+    stats = rudh.get_stats()
     
     return HealthResponse(
-        status="healthy" if rudh_instance.is_initialized else "degraded",
-        rudh_initialized=rudh_instance.is_initialized,
+        status="healthy" if rudh.is_initialized else "degraded",
+        rudh_initialized=rudh.is_initialized,
         stats=stats
     )
 
 @app.post("/chat", response_model=MessageResponse)
-async def chat_with_rudh(request: MessageRequest):
+async def chat_with_rudh(request: MessageRequest, rudh: RudhCore = Depends(get_rudh)):
     """Main chat endpoint to interact with Rudh"""
-    global rudh_instance
-    
-    if not rudh_instance:
-        raise HTTPException(status_code=503, detail="Rudh not initialized")
-    
     try:
         # Process message with Rudh
-        response = await rudh_instance.process_message(
+        response = await rudh.process_message(
             user_input=request.message,
             user_id=request.user_id
         )
         
-        return MessageResponse(
-            response=response["response"],
-            emotion_detected=response["emotion_detected"],
-            strategy_used=response.get("strategy_used", "unknown"),
-            timestamp=response["timestamp"],
-            confidence=response.get("confidence", 0.0),
-            language_detected=response.get("language_detected", "english"),
-            rudh_mood=response.get("rudh_mood", "neutral")
-        )
+        return _to_message_response(response)
         
     except Exception as e:
         logging.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
-@app.get("/conversations/{user_id}", response_model=ConversationHistoryResponse)
-async def get_conversation_history(user_id: str, limit: int = 10):
-    """Get conversation history for a user"""
-    global rudh_instance
+@app.post("/chat/batch", response_model=List[MessageResponse])
+async def chat_with_rudh_batch(request: BatchRequest, rudh: RudhCore = Depends(get_rudh)):
+    """Process several messages in one request: users in parallel, each user's messages in order"""
+    by_user: Dict[Optional[str], List[int]] = {}
+    for index, message in enumerate(request.messages):
+        by_user.setdefault(message.user_id, []).append(index)
+    results: List[Optional[MessageResponse]] = [None] * len(request.messages)
     
-    if not rudh_instance:
-        raise HTTPException(status_code=503, detail="Rudh not initialized")
+    async def _process_user(indices: List[int]):
+        # One user's session must see their messages one after another
+        for index in indices:
+            message = request.messages[index]
+            async with BATCH_CONCURRENCY:
+                response = await rudh.process_message(
+                    user_input=message.message,
+                    user_id=message.user_id
+                )
+            results[index] = _to_message_response(response)
     
     try:
-        conversations = rudh_instance.get_conversation_history(user_id, limit)
+        await asyncio.gather(*[_process_user(indices) for indices in by_user.values()])
+        return results
+        
+    except Exception as e:
+        logging.error(f"Error in chat batch endpoint: {e}")
+        raise HTTPException(status_code=500, detail=f"Error processing messages: {str(e)}")
+
+@app.post("/chat/stream")
+async def chat_with_rudh_stream(request: MessageRequest, rudh: RudhCore = Depends(get_rudh)):
+    """Chat endpoint that streams Rudh's reply as MP3 audio, sentence by sentence"""
+    synth_pool = app.state.synth_pool
+    if not synth_pool:
+        raise HTTPException(status_code=503, detail="Speech synthesis not available")
+    
+    try:
+        response = await rudh.process_message(
+            user_input=request.message,
+            user_id=request.user_id
+        )
+    except Exception as e:
+        logging.error(f"Error in chat stream endpoint: {e}")
+        raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
+    
+    text = response["response"]
+    audio_key = (synth_pool.speech_config.speech_synthesis_voice_name, _text_digest(text))
+    cached_audio = await _cache_get(AUDIO_CACHE, audio_key)
+    if cached_audio is not None:
+        return Response(content=cached_audio, media_type="audio/mpeg")
+    
+    sentences = [s for s in SENTENCE_SPLIT.split(text) if s.strip()]
+    
+    async def _stream_and_cache():
+        chunks = []
+        async for chunk in synth_pool.stream(sentences):
+            chunks.append(chunk)
+            yield chunk
+        await _cache_set(AUDIO_CACHE, audio_key, b"".join(chunks))
+    
+    return StreamingResponse(_stream_and_cache(), media_type="audio/mpeg")
+
+@app.get("/conversations/{user_id}", response_model=ConversationHistoryResponse)
+async def get_conversation_history(user_id: str, limit: int = 10,
+                                   rudh: RudhCore = Depends(get_rudh)):
+    """Get conversation history for a user"""
+    try:
+        conversations = rudh.get_conversation_history(user_id, limit)
         
         return ConversationHistoryResponse(
             conversations=conversations,
@@ -163,59 +324,73 @@ async def get_conversation_history(user_id: str, limit: int = 10):
         logging.error(f"Error getting conversation history: {e}")
         raise HTTPException(status_code=500, detail=f"Error retrieving conversations: {str(e)}")
 
-@app.get("/stats", response_model=Dict)
-async def get_rudh_stats():
+@app.get("/stats", response_model=StatsModel)
+async def get_rudh_stats(rudh: RudhCore = Depends(get_rudh)):
     """Get Rudh's operational statistics"""
-    global rudh_instance
-    
-    if not rudh_instance:
-        raise HTTPException(status_code=503, detail="Rudh not initialized")
-    
-    return rudh_instance.get_stats()
+    return rudh.get_stats()
 
 @app.post("/admin/reinitialize")
-async def reinitialize_rudh():
+async def reinitialize_rudh(request: Request):
     """Admin endpoint to reinitialize Rudh"""
-    global rudh_instance
+    rudh = request.app.state.rudh
     
     try:
-        if rudh_instance:
-            success = await rudh_instance.initialize()
+        if rudh:
+            success = await rudh.initialize()
             return {"status": "success" if success else "partial", "message": "Rudh reinitialized"}
         else:
             config = RudhConfig.get_config()
-            rudh_instance = RudhCore(config)
-            success = await rudh_instance.initialize()
+            rudh = request.app.state.rudh = await asyncio.to_thread(RudhCore, config)
+            success = await rudh.initialize()
             return {"status": "success" if success else "partial", "message": "Rudh created and initialized"}
             
     except Exception as e:
         logging.error(f"Error reinitializing Rudh: {e}")
         raise HTTPException(status_code=500, detail=f"Reinitialization failed: {str(e)}")
 
-# Error handlers
+# Error handlers (bodies are constant, so they are encoded once at import)
+NOT_FOUND_BODY = ORJSONResponse(
+    {"error": "Endpoint not found", "suggestion": "Try /docs for API documentation"}
+).body
+INTERNAL_ERROR_BODY = ORJSONResponse(
+    {"error": "Internal server error", "message": "Rudh encountered an unexpected error"}
+).body
+
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return {"error": "Endpoint not found", "suggestion": "Try /docs for API documentation"}
+    return Response(content=NOT_FOUND_BODY, status_code=404, media_type="application/json")
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return {"error": "Internal server error", "message": "Rudh encountered an unexpected error"}
+    return Response(content=INTERNAL_ERROR_BODY, status_code=500, media_type="application/json")
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     
     # Get configuration
     config = RudhConfig.get_config()
     api_config = config["api"]
     
+    # Compiled loop/parser when installed (uvloop has no Windows build); auto-reload is dev-only
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    reload = api_config["reload"] and os.getenv("RUDH_ENV") == "dev"
+    
     print("🚀 Starting Rudh AI Companion API server...")
     print(f"📍 Server will be available at: http://{api_config['host']}:{api_config['port']}")
     print(f"📚 API Documentation: http://{api_config['host']}:{api_config['port']}/docs")
     
     uvicorn.run(
-        "main:app",
+        "api.main:app",
         host=api_config["host"],
         port=api_config["port"],
-        reload=api_config["reload"],
+        loop=loop,
+        http=http,
+        workers=1 if reload else int(os.getenv("RUDH_WORKERS", "1")),
+        reload=reload,
+        timeout_keep_alive=api_config["keep_alive_timeout"],
+        limit_concurrency=api_config["limit_concurrency"],
+        backlog=api_config["backlog"],
         log_level="info"
     )
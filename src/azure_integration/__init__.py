@@ -1,4 +1,4 @@
 # src\azure_integration\__init__.py
 """Azure integration module for Rudh AI Companion"""
-from .azure_services import RudhAzureIntegration, AzureConfigBuilder
-__all__ = ['RudhAzureIntegration', 'AzureConfigBuilder']
+from .azure_services import RudhAzureIntegration, AzureConfigBuilder, SynthesizerPool
+__all__ = ['RudhAzureIntegration', 'AzureConfigBuilder', 'SynthesizerPool']
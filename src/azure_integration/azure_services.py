@@ -5,19 +5,32 @@ Production-grade Azure AI services integration for Rudh
 """
 
 import asyncio
+import importlib.util
+import io
 import logging
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import os
+import random
+import re
+import time
+import wave
+from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, ClassVar, Dict, List, Optional
+from xml.sax.saxutils import escape
+from dataclasses import dataclass, field
+
+from anyio import CapacityLimiter, to_thread
 
 # Azure SDK imports with fallbacks
 try:
-    from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+    from azure.identity import DefaultAzureCredential, ManagedIdentityCredential, get_bearer_token_provider
     from azure.keyvault.secrets import SecretClient
     from azure.cognitiveservices.speech import SpeechConfig, SpeechSynthesizer, AudioConfig
     from azure.ai.translation.text import TextTranslationClient
     from azure.core.credentials import AzureKeyCredential
+    from azure.core.pipeline.transport import RequestsTransport
+    import requests
     from azure.search.documents import SearchClient
     from azure.search.documents.models import VectorizedQuery
     import openai
@@ -26,7 +39,162 @@ except ImportError as e:
     print(f"Azure SDK not available: {e}")
     AZURE_SDK_AVAILABLE = False
 
-@dataclass
+# Shared async HTTP client for OpenAI (HTTP/2 when h2 is installed)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Speech SDK on its own so synthesis pooling works without the wider Azure stack
+try:
+    import azure.cognitiveservices.speech as speechsdk
+    SPEECH_SDK_AVAILABLE = True
+except ImportError:
+    SPEECH_SDK_AVAILABLE = False
+
+_retry_logger = logging.getLogger('RudhAzureRetry')
+
+# HTTP statuses worth retrying: throttling, sporadic MI auth failures and gateway errors
+RETRY_STATUS_CODES = frozenset({401, 429, 500, 502, 503, 504})
+TRANSIENT_SPEECH_ERRORS = frozenset({'ServiceTimeout', 'ServiceUnavailable', 'ConnectionFailure', 'TooManyRequests'})
+
+class TransientServiceError(Exception):
+    """Failure that is expected to clear on retry (e.g. a speech service timeout)"""
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, TransientServiceError):
+        return True
+    if AZURE_SDK_AVAILABLE and isinstance(error, (openai.RateLimitError, openai.APITimeoutError)):
+        return True
+    # azure.core HttpResponseError and openai APIStatusError both expose status_code
+    return getattr(error, 'status_code', None) in RETRY_STATUS_CODES
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    value = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+async def _with_retry(coro_factory, retries: int = 3, base: float = 0.5):
+    """Await coro_factory(), retrying transient errors with exponential backoff and jitter"""
+    for attempt in range(retries):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            if attempt == retries - 1 or not _is_transient(e):
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = base * 2 ** attempt + random.uniform(0, 0.25)
+            _retry_logger.warning(
+                "Transient Azure error (%s); retry %d/%d in %.2fs", e, attempt + 1, retries - 1, delay
+            )
+            await asyncio.sleep(min(delay, 30.0))
+
+class CircuitBreaker:
+    """Skips a failing service for a cooldown after consecutive failures"""
+    
+    logger = logging.getLogger('RudhCircuitBreaker')
+    
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 30.0,
+                 half_open_probes: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probes_in_flight = 0
+    
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return 'open'
+        return 'half_open'
+    
+    def is_open(self) -> bool:
+        """True while calls should be skipped (cooling down, or half-open probes used up)"""
+        state = self.state
+        return state == 'open' or (state == 'half_open' and self._probes_in_flight >= self.half_open_probes)
+    
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+    
+    def record_failure(self):
+        self._failures += 1
+        # A failed half-open probe re-opens immediately
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                self.logger.warning("Circuit for %s opened after %d failures", self.name, self._failures)
+            self._opened_at = time.monotonic()
+    
+    async def call(self, coro):
+        """Await coro, recording the outcome"""
+        probing = self.state == 'half_open'
+        if probing:
+            self._probes_in_flight += 1
+        try:
+            result = await coro
+        except Exception:
+            self.record_failure()
+            raise
+        else:
+            self.record_success()
+            return result
+        finally:
+            if probing:
+                self._probes_in_flight -= 1
+
+# Sentence boundary in streamed text; the punctuation stays with its sentence
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+def _join_wav(parts: List[bytes]) -> bytes:
+    """Concatenate per-sentence WAV clips (same format) into a single WAV"""
+    if len(parts) == 1:
+        return parts[0]
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as joined:
+        for index, part in enumerate(parts):
+            with wave.open(io.BytesIO(part), 'rb') as clip:
+                if index == 0:
+                    joined.setparams(clip.getparams())
+                joined.writeframes(clip.readframes(clip.getnframes()))
+    return output.getvalue()
+
+def _dedup_key(obj) -> bytes:
+    """Canonical JSON bytes used to group identical requests (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def _usage_dict(usage) -> Optional[Dict]:
+    """Plain-dict copy of an OpenAI usage object, so responses serialize without pydantic"""
+    return usage.model_dump() if usage is not None else None
+
+# (epoch second, ISO string) so hot paths format a timestamp at most once per second
+_iso_cache = (0, "")
+
+def _iso_now() -> str:
+    """UTC ISO-8601 timestamp, cached per second"""
+    global _iso_cache
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache = (now, datetime.fromtimestamp(now, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'))
+    return _iso_cache[1]
+
+@dataclass(frozen=True, slots=True)
 class AzureServiceConfig:
     """Configuration for Azure services"""
     subscription_id: str
@@ -40,15 +208,41 @@ class AzureServiceConfig:
     translator_key: str
     search_endpoint: str
     search_key: str
+    warmup: bool = False
+    rate_limit_rpm: Optional[int] = None  # OpenAI requests per minute; None means unthrottled
+    key_vault_url: str = field(init=False, repr=False)
+    translator_endpoint: str = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        for name in ('key_vault_name', 'region', 'speech_region'):
+            if not getattr(self, name):
+                raise ValueError(f"AzureServiceConfig.{name} must not be empty")
+        
+        # Derived endpoints, formatted once (frozen + slots rules out cached_property)
+        object.__setattr__(self, 'key_vault_url', f"https://{self.key_vault_name}.vault.azure.net/")
+        object.__setattr__(self, 'translator_endpoint', "https://api.cognitive.microsofttranslator.com")
+
+def build_credential():
+    """Managed Identity when hosted in Azure (skips the DefaultAzureCredential probe chain)"""
+    if os.getenv("RUDH_ENV") == "production" or os.getenv("IDENTITY_ENDPOINT"):
+        return ManagedIdentityCredential(client_id=os.getenv("RUDH_MI_CLIENT_ID"))
+    return DefaultAzureCredential(exclude_interactive_browser_credential=True)
 
 class AzureCredentialManager:
     """Secure credential management using Azure Key Vault"""
     
-    def __init__(self, key_vault_url: str):
+    logger = logging.getLogger('AzureCredentials')
+    
+    def __init__(self, key_vault_url: str, cache_ttl: float = 600, credential=None, transport=None):
         self.key_vault_url = key_vault_url
-        self.credential = None
+        self.credential = credential
+        self.transport = transport
         self.secret_client = None
-        self.logger = logging.getLogger('AzureCredentials')
+        
+        # Secrets rarely change, so keep them in memory instead of hitting Key Vault per call
+        self._cache: Dict[str, tuple] = {}
+        self._cache_ttl = cache_ttl
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
         
     async def initialize(self) -> bool:
         """Initialize Azure credentials securely"""
@@ -58,12 +252,15 @@ class AzureCredentialManager:
                 return False
                 
             # Use Managed Identity in production, DefaultAzureCredential for development
-            self.credential = DefaultAzureCredential()
+            if self.credential is None:
+                self.credential = build_credential()
             
             # Initialize Key Vault client
+            client_kwargs = {'transport': self.transport} if self.transport else {}
             self.secret_client = SecretClient(
                 vault_url=self.key_vault_url,
-                credential=self.credential
+                credential=self.credential,
+                **client_kwargs
             )
             
             # Test credential access
@@ -76,59 +273,82 @@ class AzureCredentialManager:
             self.logger.error(f"Failed to initialize Azure credentials: {e}")
             return False
     
+    def _cached_secret(self, secret_name: str) -> Optional[str]:
+        cached = self._cache.get(secret_name)
+        if cached and time.monotonic() - cached[1] < self._cache_ttl:
+            return cached[0]
+        return None
+    
     async def get_secret(self, secret_name: str) -> Optional[str]:
-        """Securely retrieve secret from Key Vault"""
-        try:
-            if not self.secret_client:
-                await self.initialize()
-                
-            secret = await self.secret_client.get_secret(secret_name)
-            return secret.value
+        """Securely retrieve secret from Key Vault (cached for cache_ttl seconds)"""
+        value = self._cached_secret(secret_name)
+        if value is not None:
+            return value
+        
+        # One fetch per secret at a time; concurrent callers wait and reuse its result
+        lock = self._cache_locks.setdefault(secret_name, asyncio.Lock())
+        async with lock:
+            value = self._cached_secret(secret_name)
+            if value is not None:
+                return value
             
-        except Exception as e:
-            self.logger.error(f"Failed to retrieve secret {secret_name}: {e}")
-            return None
+            try:
+                if not self.secret_client:
+                    await self.initialize()
+                    
+                # SecretClient is synchronous; keep its HTTPS round-trip off the event loop
+                secret = await _with_retry(
+                    lambda: asyncio.to_thread(self.secret_client.get_secret, secret_name)
+                )
+                self._cache[secret_name] = (secret.value, time.monotonic())
+                return secret.value
+                
+            except Exception as e:
+                self.logger.error(f"Failed to retrieve secret {secret_name}: {e}")
+                return None
     
     async def _test_key_vault_access(self):
         """Test Key Vault connectivity"""
         try:
-            # Try to list secrets (metadata only)
-            secrets = self.secret_client.list_properties_of_secrets()
-            secret_count = len(list(secrets))
-            self.logger.info(f"Key Vault access confirmed. {secret_count} secrets available.")
+            # Fetching the first page of secret metadata proves access; don't drain the pager
+            await asyncio.to_thread(
+                lambda: next(iter(self.secret_client.list_properties_of_secrets()), None)
+            )
+            self.logger.info("Key Vault reachable")
         except Exception as e:
             raise Exception(f"Key Vault access test failed: {e}")
 
 class RudhAzureOpenAI:
     """Enhanced Azure OpenAI integration for Rudh"""
     
+    logger = logging.getLogger('RudhAzureOpenAI')
+    
     def __init__(self, credential_manager: AzureCredentialManager):
         self.credential_manager = credential_manager
         self.client = None
         self.deployment_name = None
-        self.logger = logging.getLogger('RudhAzureOpenAI')
+        self.breaker = CircuitBreaker('openai')
         
-    async def initialize(self, endpoint: str, deployment_name: str) -> bool:
+    async def initialize(self, endpoint: str, deployment_name: str, http_client=None) -> bool:
         """Initialize Azure OpenAI client"""
         try:
-            # Get API key from Key Vault
-            api_key = await self.credential_manager.get_secret("rudh-openai-key")
-            if not api_key:
-                self.logger.error("Failed to retrieve OpenAI API key")
-                return False
-                
-            # Initialize OpenAI client
-            self.client = openai.AzureOpenAI(
-                api_key=api_key,
+            # Authenticate with the shared AAD credential so its token cache is reused
+            # (and no API key has to be fetched from Key Vault)
+            token_provider = get_bearer_token_provider(
+                self.credential_manager.credential,
+                "https://cognitiveservices.azure.com/.default"
+            )
+            
+            # Initialize OpenAI client (async, since generate_response awaits it)
+            self.client = openai.AsyncAzureOpenAI(
+                azure_ad_token_provider=token_provider,
                 api_version="2024-02-15-preview",
-                azure_endpoint=endpoint
+                azure_endpoint=endpoint,
+                http_client=http_client
             )
             
             self.deployment_name = deployment_name
             
-            # Test connectivity
-            await self._test_openai_connection()
-            
             self.logger.info("Azure OpenAI initialized successfully")
             return True
             
@@ -136,35 +356,80 @@ class RudhAzureOpenAI:
             self.logger.error(f"Failed to initialize Azure OpenAI: {e}")
             return False
     
+    async def _create_completion(self, messages: List[Dict], n: int = 1, stream: bool = False, **kwargs):
+        """Issue one chat.completions call (with retries) returning the raw response"""
+        if not self.client:
+            raise Exception("Azure OpenAI not initialized")
+            
+        return await _with_retry(lambda: self.client.chat.completions.create(
+            model=self.deployment_name,
+            messages=messages,
+            n=n,
+            stream=stream,
+            max_tokens=kwargs.get('max_tokens', 800),
+            temperature=kwargs.get('temperature', 0.7),
+            top_p=kwargs.get('top_p', 0.9),
+            frequency_penalty=kwargs.get('frequency_penalty', 0.1),
+            presence_penalty=kwargs.get('presence_penalty', 0.1)
+        ))
+    
     async def generate_response(self, messages: List[Dict], **kwargs) -> Dict:
         """Generate response using Azure OpenAI"""
         try:
-            if not self.client:
-                raise Exception("Azure OpenAI not initialized")
-                
-            response = await self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=messages,
-                max_tokens=kwargs.get('max_tokens', 800),
-                temperature=kwargs.get('temperature', 0.7),
-                top_p=kwargs.get('top_p', 0.9),
-                frequency_penalty=kwargs.get('frequency_penalty', 0.1),
-                presence_penalty=kwargs.get('presence_penalty', 0.1)
-            )
+            response = await self._create_completion(messages, **kwargs)
             
             return {
                 'content': response.choices[0].message.content,
-                'usage': response.usage,
+                'usage': _usage_dict(response.usage),
                 'model': response.model,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _iso_now()
             }
             
         except Exception as e:
             self.logger.error(f"OpenAI generation failed: {e}")
             raise
     
-    async def _test_openai_connection(self):
-        """Test OpenAI connectivity"""
+    async def stream_response(self, messages: List[Dict], **kwargs):
+        """Yield content deltas as Azure OpenAI generates them"""
+        stream = await self._create_completion(messages, stream=True, **kwargs)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def generate_responses_batch(self, batch: List[List[Dict]], throttle=None, **kwargs) -> List[Dict]:
+        """Generate responses for several conversations, one request per distinct conversation
+        
+        An entry is None when the service returned fewer choices than requested
+        (e.g. some were dropped by content filtering).
+        """
+        # Identical conversations share a single call with n=<copies>
+        groups: Dict[bytes, List[int]] = {}
+        for index, messages in enumerate(batch):
+            groups.setdefault(_dedup_key(messages), []).append(index)
+        
+        results: List[Optional[Dict]] = [None] * len(batch)
+        
+        async def _run_group(indices: List[int]):
+            if throttle is not None:
+                async with throttle():
+                    response = await self._create_completion(batch[indices[0]], n=len(indices), **kwargs)
+            else:
+                response = await self._create_completion(batch[indices[0]], n=len(indices), **kwargs)
+            timestamp = _iso_now()
+            usage = _usage_dict(response.usage)
+            for index, choice in zip(indices, response.choices):
+                results[index] = {
+                    'content': choice.message.content,
+                    'usage': usage,
+                    'model': response.model,
+                    'timestamp': timestamp
+                }
+        
+        await asyncio.gather(*(_run_group(indices) for indices in groups.values()))
+        return results
+    
+    async def warmup(self):
+        """Test OpenAI connectivity with a live completion"""
         test_messages = [
             {"role": "system", "content": "You are a helpful assistant."},
             {"role": "user", "content": "Hello"}
@@ -176,20 +441,235 @@ class RudhAzureOpenAI:
         else:
             raise Exception("OpenAI connection test failed")
 
+class BatchProcessor:
+    """Collects generate_response calls for a short window and dispatches them as one batch"""
+    
+    logger = logging.getLogger('RudhBatchProcessor')
+    
+    def __init__(self, openai_service: RudhAzureOpenAI, max_concurrency: int = 8,
+                 rate_limit: Optional[int] = None, window: float = 0.05):
+        self.openai_service = openai_service
+        self.rate_limit = rate_limit  # requests per minute; None disables the token bucket
+        self.window = window
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tokens = float(rate_limit or 0)
+        self._last_refill = time.monotonic()
+        self._pending: List[tuple] = []
+        self._flush_handle = None
+        self._tasks: set = set()
+    
+    async def submit(self, messages: List[Dict], **kwargs) -> Dict:
+        """Queue one conversation and wait for its response"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((messages, kwargs, future))
+        if self._flush_handle is None:
+            # Decide on the next loop pass whether this is a lone request or the start of a burst
+            self._flush_handle = loop.call_soon(self._schedule_flush, loop)
+        return await future
+    
+    def _schedule_flush(self, loop):
+        if len(self._pending) == 1:
+            # Nothing to batch with; don't make a lone request wait out the window
+            self._flush()
+        else:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+    
+    def _flush(self):
+        batch, self._pending, self._flush_handle = self._pending, [], None
+        # Requests with different generation settings can't share a call
+        by_settings: Dict[bytes, List[tuple]] = {}
+        for item in batch:
+            by_settings.setdefault(_dedup_key(item[1]), []).append(item)
+        for items in by_settings.values():
+            # The loop only keeps weak references to tasks
+            task = asyncio.create_task(self._dispatch(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _dispatch(self, items: List[tuple]):
+        try:
+            results = await self.openai_service.generate_responses_batch(
+                [messages for messages, _, _ in items], throttle=self._throttle, **items[0][1]
+            )
+            for (_, _, future), result in zip(items, results):
+                if future.done():
+                    continue
+                if result is None:
+                    future.set_exception(RuntimeError(
+                        "OpenAI returned no choice for this conversation (possibly filtered)"
+                    ))
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            self.logger.error(f"Batch generation failed: {e}")
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+    
+    async def _take_token(self):
+        """Token bucket refilled at rate_limit per minute"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit / 60)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) * 60 / self.rate_limit)
+    
+    @asynccontextmanager
+    async def _throttle(self):
+        async with self._semaphore:
+            if self.rate_limit:
+                await self._take_token()
+            yield
+
+# Bounds threads blocked in Speech SDK calls to the number of open websockets
+SYNTH_LIMITER = CapacityLimiter(int(os.getenv("RUDH_SYNTH_CONCURRENCY", "4")))
+
+class SynthesizerPool:
+    """Pre-warmed SpeechSynthesizers with open connections, shared across requests"""
+    
+    logger = logging.getLogger('RudhSynthesizerPool')
+    
+    def __init__(self, speech_config, size: int = 4):
+        self.speech_config = speech_config
+        self.size = size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._connections = []
+    
+    @classmethod
+    def from_key(cls, key: str, region: str, voice: str, size: int = 4,
+                 output_format=None) -> 'SynthesizerPool':
+        """Build a pool for one subscription key, region and voice"""
+        speech_config = speechsdk.SpeechConfig(subscription=key, region=region)
+        speech_config.speech_synthesis_voice_name = voice
+        if output_format is not None:
+            speech_config.set_speech_synthesis_output_format(output_format)
+        return cls(speech_config, size)
+    
+    def _build(self):
+        """Create one synthesizer and open its websocket (blocking)"""
+        synthesizer = speechsdk.SpeechSynthesizer(speech_config=self.speech_config, audio_config=None)
+        connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+        connection.open(True)
+        return synthesizer, connection
+    
+    async def open(self):
+        """Build all synthesizers off the event loop"""
+        built = await asyncio.gather(*(
+            to_thread.run_sync(self._build, limiter=SYNTH_LIMITER) for _ in range(self.size)
+        ))
+        for synthesizer, connection in built:
+            self._connections.append(connection)
+            self._queue.put_nowait(synthesizer)
+        self.logger.info("Synthesizer pool ready with %d connections", self.size)
+    
+    async def warmup(self, text: str = "."):
+        """Speak a short utterance on every pooled synthesizer to settle its connection"""
+        async def _speak_once():
+            async with self.acquire() as synthesizer:
+                await to_thread.run_sync(lambda: synthesizer.speak_text_async(text).get(), limiter=SYNTH_LIMITER)
+        
+        # Each call holds its synthesizer until done, so every one in the pool is used once
+        await asyncio.gather(*(_speak_once() for _ in range(self.size)))
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a synthesizer for the duration of the block"""
+        synthesizer = await self._queue.get()
+        try:
+            yield synthesizer
+        finally:
+            self._queue.put_nowait(synthesizer)
+    
+    async def stream(self, sentences: List[str]):
+        """Yield audio chunks for each sentence as the SDK produces them"""
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        
+        # SDK callbacks fire on its own threads; hand chunks to the loop, None marks the end
+        def on_chunk(evt):
+            loop.call_soon_threadsafe(chunks.put_nowait, evt.result.audio_data)
+        
+        def on_done(evt):
+            loop.call_soon_threadsafe(chunks.put_nowait, None)
+        
+        async with self.acquire() as synthesizer:
+            synthesizer.synthesizing.connect(on_chunk)
+            synthesizer.synthesis_completed.connect(on_done)
+            synthesizer.synthesis_canceled.connect(on_done)
+            speaking = False
+            try:
+                for sentence in sentences:
+                    future = synthesizer.speak_text_async(sentence)
+                    speaking = True
+                    while (chunk := await chunks.get()) is not None:
+                        yield chunk
+                    speaking = False
+                    result = await to_thread.run_sync(future.get, limiter=SYNTH_LIMITER)
+                    if result.reason == speechsdk.ResultReason.Canceled:
+                        details = speechsdk.CancellationDetails(result)
+                        self.logger.error(f"Streaming synthesis canceled: {details.error_details}")
+                        raise RuntimeError("Speech synthesis canceled while streaming")
+            finally:
+                if speaking:
+                    # Consumer left mid-sentence; silence it before the next borrower gets it
+                    await self.stop(synthesizer)
+                synthesizer.synthesizing.disconnect_all()
+                synthesizer.synthesis_completed.disconnect_all()
+                synthesizer.synthesis_canceled.disconnect_all()
+    
+    async def stop(self, synthesizer):
+        """Stop any synthesis still running on a borrowed synthesizer"""
+        try:
+            await to_thread.run_sync(lambda: synthesizer.stop_speaking_async().get(), limiter=SYNTH_LIMITER)
+        except Exception as e:
+            self.logger.warning("Failed to stop speech synthesis: %s", e)
+    
+    def close(self):
+        """Close every pooled connection"""
+        for connection in self._connections:
+            try:
+                connection.close()
+            except Exception as e:
+                self.logger.warning("Failed to close speech connection: %s", e)
+        self._connections.clear()
+
 class RudhSpeechServices:
     """Azure Speech Services integration for voice capabilities"""
     
+    logger = logging.getLogger('RudhSpeech')
+    
+    _STYLE_MAP: ClassVar[Dict[str, str]] = {
+        'friendly': 'friendly',
+        'empathetic': 'empathetic',
+        'excited': 'excited',
+        'calm': 'calm',
+        'professional': 'news'
+    }
+    
+    _SSML_TMPL: ClassVar[str] = (
+        '<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" '
+        'xmlns:mstts="https://www.w3.org/2001/mstts" xml:lang="en-IN">'
+        '<voice name="en-IN-PrabhatNeural">'
+        '<mstts:express-as style="%s">'
+        '<prosody rate="0.9" pitch="+5%%">%s</prosody>'
+        '</mstts:express-as>'
+        '</voice>'
+        '</speak>'
+    )
+    
     def __init__(self, credential_manager: AzureCredentialManager):
         self.credential_manager = credential_manager
         self.speech_config = None
-        self.synthesizer = None
-        self.logger = logging.getLogger('RudhSpeech')
+        self.pool = None
+        self.breaker = CircuitBreaker('speech')
         
-    async def initialize(self, region: str) -> bool:
-        """Initialize Speech Services"""
+    async def initialize(self, region: str, speech_key: Optional[str]) -> bool:
+        """Initialize Speech Services with a key prefetched from Key Vault"""
         try:
-            # Get Speech key from Key Vault
-            speech_key = await self.credential_manager.get_secret("rudh-speech-key")
             if not speech_key:
                 self.logger.error("Failed to retrieve Speech API key")
                 return False
@@ -203,11 +683,9 @@ class RudhSpeechServices:
             # Configure voice for Rudh (warm, professional)
             self.speech_config.speech_synthesis_voice_name = "en-IN-PrabhatNeural"  # Indian English voice
             
-            # Initialize synthesizer
-            self.synthesizer = SpeechSynthesizer(speech_config=self.speech_config)
-            
-            # Test synthesis
-            await self._test_speech_synthesis()
+            # Pre-warmed synthesizers so concurrent requests don't queue on one websocket
+            self.pool = SynthesizerPool(self.speech_config, size=int(os.getenv("RUDH_SYNTH_POOL", "4")))
+            await self.pool.open()
             
             self.logger.info("Speech Services initialized successfully")
             return True
@@ -219,50 +697,81 @@ class RudhSpeechServices:
     async def synthesize_speech(self, text: str, voice_style: str = "friendly") -> bytes:
         """Convert text to speech with emotional styling"""
         try:
-            if not self.synthesizer:
+            if not self.pool:
                 raise Exception("Speech Services not initialized")
                 
             # Enhanced SSML for emotional expression
             ssml_text = self._create_emotional_ssml(text, voice_style)
             
-            # Synthesize speech
-            result = self.synthesizer.speak_ssml_async(ssml_text).get()
-            
-            if result.reason.name == 'SynthesizingAudioCompleted':
-                return result.audio_data
-            else:
+            async def _synthesize() -> bytes:
+                # .get() blocks for the whole round-trip, so wait on a worker thread
+                async with self.pool.acquire() as synthesizer:
+                    result = await to_thread.run_sync(
+                        lambda: synthesizer.speak_ssml_async(ssml_text).get(),
+                        limiter=SYNTH_LIMITER
+                    )
+                
+                if result.reason.name == 'SynthesizingAudioCompleted':
+                    return result.audio_data
+                if result.reason.name == 'Canceled':
+                    details = speechsdk.CancellationDetails(result)
+                    if details.error_code.name in TRANSIENT_SPEECH_ERRORS:
+                        raise TransientServiceError(f"Speech synthesis canceled: {details.error_code.name}")
                 raise Exception(f"Speech synthesis failed: {result.reason}")
+            
+            return await _with_retry(_synthesize)
                 
         except Exception as e:
             self.logger.error(f"Speech synthesis failed: {e}")
             raise
     
-    def _create_emotional_ssml(self, text: str, style: str) -> str:
-        """Create SSML with emotional styling"""
-        style_map = {
-            'friendly': 'friendly',
-            'empathetic': 'empathetic', 
-            'excited': 'excited',
-            'calm': 'calm',
-            'professional': 'news'
-        }
-        
-        voice_style = style_map.get(style, 'friendly')
+    async def stream_speech(self, text: str, voice_style: str = "friendly",
+                            chunk_size: int = 16000) -> AsyncIterator[bytes]:
+        """Yield synthesized audio in chunks as it arrives, instead of buffering the whole clip
         
-        return f"""
-        <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="en-IN">
-            <voice name="en-IN-PrabhatNeural">
-                <mstts:express-as style="{voice_style}">
-                    <prosody rate="0.9" pitch="+5%">
-                        {text}
-                    </prosody>
-                </mstts:express-as>
-            </voice>
-        </speak>
+        Chunks are raw audio in the configured output format (AudioDataStream drops the RIFF
+        header); use synthesize_speech when a complete WAV file is needed.
         """
+        if not self.pool:
+            raise Exception("Speech Services not initialized")
+        
+        ssml_text = self._create_emotional_ssml(text, voice_style)
+        
+        async with self.pool.acquire() as synthesizer:
+            # start_speaking returns once the first audio is ready, not when synthesis ends
+            result = await _with_retry(lambda: to_thread.run_sync(
+                lambda: synthesizer.start_speaking_ssml_async(ssml_text).get(),
+                limiter=SYNTH_LIMITER
+            ))
+            if result.reason.name == 'Canceled':
+                details = speechsdk.CancellationDetails(result)
+                raise Exception(f"Speech synthesis failed: {details.error_details}")
+            
+            stream = speechsdk.AudioDataStream(result)
+            buffer = bytes(chunk_size)
+            finished = False
+            try:
+                # One blocking read per hop keeps at most one chunk in flight
+                while (filled := await to_thread.run_sync(stream.read_data, buffer, limiter=SYNTH_LIMITER)) > 0:
+                    yield buffer[:filled]
+                finished = True
+            finally:
+                if not finished:
+                    # Consumer left early; silence it before the synthesizer goes back to the pool
+                    await self.pool.stop(synthesizer)
+            
+            if stream.status == speechsdk.StreamStatus.Canceled:
+                details = stream.cancellation_details
+                self.logger.error("Streaming synthesis canceled: %s", details.error_details)
+                raise Exception(f"Speech synthesis canceled: {details.reason}")
     
-    async def _test_speech_synthesis(self):
-        """Test speech synthesis"""
+    def _create_emotional_ssml(self, text: str, style: str) -> str:
+        """Create SSML with emotional styling"""
+        return self._SSML_TMPL % (self._STYLE_MAP.get(style, 'friendly'), escape(text))
+    
+    async def warmup(self):
+        """Settle every pooled connection, then test speech synthesis with a live utterance"""
+        await self.pool.warmup()
         test_text = "Hello! I'm Rudh, your AI companion."
         audio_data = await self.synthesize_speech(test_text)
         if audio_data and len(audio_data) > 0:
@@ -273,31 +782,31 @@ class RudhSpeechServices:
 class RudhTranslator:
     """Azure Translator integration for multilingual support"""
     
+    logger = logging.getLogger('RudhTranslator')
+    
     def __init__(self, credential_manager: AzureCredentialManager):
         self.credential_manager = credential_manager
         self.client = None
-        self.logger = logging.getLogger('RudhTranslator')
+        self.breaker = CircuitBreaker('translator')
         
-    async def initialize(self, region: str) -> bool:
-        """Initialize Translator service"""
+    async def initialize(self, region: str, translator_key: Optional[str], transport=None,
+                         endpoint: str = "https://api.cognitive.microsofttranslator.com") -> bool:
+        """Initialize Translator service with a key prefetched from Key Vault"""
         try:
-            # Get Translator key from Key Vault
-            translator_key = await self.credential_manager.get_secret("rudh-translator-key")
             if not translator_key:
                 self.logger.error("Failed to retrieve Translator API key")
                 return False
                 
             # Initialize Translator client
             credential = AzureKeyCredential(translator_key)
+            client_kwargs = {'transport': transport} if transport else {}
             self.client = TextTranslationClient(
-                endpoint="https://api.cognitive.microsofttranslator.com",
+                endpoint=endpoint,
                 credential=credential,
-                region=region
+                region=region,
+                **client_kwargs
             )
             
-            # Test translation
-            await self._test_translation()
-            
             self.logger.info("Translator initialized successfully")
             return True
             
@@ -315,12 +824,13 @@ class RudhTranslator:
             # Prepare translation request
             input_text = [{"text": text}]
             
-            # Perform translation
-            response = self.client.translate(
+            # Perform translation (sync client, so run it on a worker thread)
+            response = await _with_retry(lambda: asyncio.to_thread(
+                self.client.translate,
                 content=input_text,
                 to=[target_language],
                 from_language=source_language
-            )
+            ))
             
             translation_result = response[0]
             
@@ -335,8 +845,8 @@ class RudhTranslator:
             self.logger.error(f"Translation failed: {e}")
             raise
     
-    async def _test_translation(self):
-        """Test translation service"""
+    async def warmup(self):
+        """Test translation service with a live request"""
         test_result = await self.translate_text("Hello", "ta")  # English to Tamil
         if test_result and 'translated_text' in test_result:
             self.logger.info("Translation test successful")
@@ -346,13 +856,20 @@ class RudhTranslator:
 class RudhAzureIntegration:
     """Main Azure services integration manager for Rudh"""
     
+    logger = logging.getLogger('RudhAzureIntegration')
+    
     def __init__(self, config: AzureServiceConfig):
         self.config = config
         self.credential_manager = None
         self.openai_service = None
         self.speech_service = None
         self.translator_service = None
-        self.logger = logging.getLogger('RudhAzureIntegration')
+        self.batch_processor = None
+        self._shared_credential = None
+        self._http = None
+        self._session = None
+        self._sync_transport = None
+        self._hc_cache = None
         
         # Integration status
         self.services_status = {
@@ -368,20 +885,30 @@ class RudhAzureIntegration:
         try:
             self.logger.info("Initializing Azure services for Rudh...")
             
-            # Initialize credential management
-            key_vault_url = f"https://{self.config.key_vault_name}.vault.azure.net/"
-            self.credential_manager = AzureCredentialManager(key_vault_url)
+            # One credential (and MSAL token cache) shared by Key Vault and every service client
+            if AZURE_SDK_AVAILABLE and self._shared_credential is None:
+                self._shared_credential = build_credential()
+            self._open_http_clients()
+            self.credential_manager = AzureCredentialManager(
+                self.config.key_vault_url, credential=self._shared_credential, transport=self._sync_transport
+            )
             self.services_status['credentials'] = await self.credential_manager.initialize()
             
             if not self.services_status['credentials']:
                 self.logger.error("Failed to initialize credentials. Stopping initialization.")
                 return self.services_status
             
+            # Fetch every service key in one round of concurrent Key Vault calls
+            speech_key, translator_key = await asyncio.gather(
+                self.credential_manager.get_secret("rudh-speech-key"),
+                self.credential_manager.get_secret("rudh-translator-key")
+            )
+            
             # Initialize services concurrently for faster startup
             initialization_tasks = [
                 self._initialize_openai(),
-                self._initialize_speech(),
-                self._initialize_translator()
+                self._initialize_speech(speech_key),
+                self._initialize_translator(translator_key)
             ]
             
             # Wait for all services to initialize
@@ -397,11 +924,15 @@ class RudhAzureIntegration:
                 else:
                     self.services_status[service_name] = result
             
+            # Live test calls are optional; they cost a billable round-trip per service
+            if self.config.warmup:
+                await self._warmup_services()
+            
             # Log overall status
             successful_services = sum(self.services_status.values())
             total_services = len(self.services_status)
             
-            self.logger.info(f"Azure services initialization complete: {successful_services}/{total_services} services active")
+            self.logger.info("Azure services initialization complete: %d/%d services active", successful_services, total_services)
             
             return self.services_status
             
@@ -409,40 +940,140 @@ class RudhAzureIntegration:
             self.logger.error(f"Failed to initialize Azure services: {e}")
             return self.services_status
     
+    async def _warmup_services(self):
+        """Run each initialized service's live test call concurrently"""
+        services = {
+            'openai': self.openai_service,
+            'speech': self.speech_service,
+            'translator': self.translator_service
+        }
+        active = [name for name, service in services.items() if service and self.services_status[name]]
+        results = await asyncio.gather(*(services[name].warmup() for name in active), return_exceptions=True)
+        for name, result in zip(active, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"{name} warmup failed: {result}")
+                self.services_status[name] = False
+    
+    def _open_http_clients(self):
+        """Create the connection pools shared by every service client"""
+        if self._http is None and HTTPX_AVAILABLE:
+            limits = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+            transport = httpx.AsyncHTTPTransport(
+                http2=importlib.util.find_spec("h2") is not None, retries=0, limits=limits
+            )
+            self._http = httpx.AsyncClient(limits=limits, transport=transport, timeout=httpx.Timeout(30.0))
+        
+        # Key Vault and Translator are sync clients run on worker threads; share one requests pool
+        if self._session is None and AZURE_SDK_AVAILABLE:
+            self._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50)
+            self._session.mount("https://", adapter)
+            self._sync_transport = RequestsTransport(session=self._session, session_owner=False)
+    
+    async def close(self):
+        """Dispose of pooled connections on shutdown"""
+        if self.speech_service and self.speech_service.pool:
+            self.speech_service.pool.close()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+            self._sync_transport = None
+    
     async def _initialize_openai(self) -> bool:
         """Initialize OpenAI service"""
         try:
             self.openai_service = RudhAzureOpenAI(self.credential_manager)
+            self.batch_processor = BatchProcessor(self.openai_service, rate_limit=self.config.rate_limit_rpm)
             return await self.openai_service.initialize(
                 self.config.openai_endpoint,
-                self.config.openai_deployment_name
+                self.config.openai_deployment_name,
+                http_client=self._http
             )
         except Exception as e:
             self.logger.error(f"OpenAI initialization failed: {e}")
             return False
     
-    async def _initialize_speech(self) -> bool:
+    async def _initialize_speech(self, speech_key: Optional[str]) -> bool:
         """Initialize Speech service"""
         try:
             self.speech_service = RudhSpeechServices(self.credential_manager)
-            return await self.speech_service.initialize(self.config.speech_region)
+            return await self.speech_service.initialize(self.config.speech_region, speech_key)
         except Exception as e:
             self.logger.error(f"Speech initialization failed: {e}")
             return False
     
-    async def _initialize_translator(self) -> bool:
+    async def _initialize_translator(self, translator_key: Optional[str]) -> bool:
         """Initialize Translator service"""
         try:
             self.translator_service = RudhTranslator(self.credential_manager)
-            return await self.translator_service.initialize(self.config.speech_region)
+            return await self.translator_service.initialize(
+                self.config.speech_region, translator_key, transport=self._sync_transport,
+                endpoint=self.config.translator_endpoint
+            )
         except Exception as e:
             self.logger.error(f"Translator initialization failed: {e}")
             return False
     
+    async def _background(self, service_name: str, coro, services_used: List[str]):
+        """Run a non-critical service call, returning None instead of raising"""
+        try:
+            result = await coro
+            services_used.append(service_name)
+            return result
+        except Exception as e:
+            self.logger.warning("%s failed: %s", service_name, e)
+            return None
+    
+    async def _stream_text_and_speech(self, messages: List[Dict], response_style: str):
+        """Stream OpenAI text while pool workers synthesize each finished sentence
+        
+        Returns the full text and a coroutine that yields the in-order joined audio.
+        """
+        sentences: asyncio.Queue = asyncio.Queue()
+        audio_parts: Dict[int, bytes] = {}
+        
+        async def _worker():
+            while (item := await sentences.get()) is not None:
+                index, sentence = item
+                audio_parts[index] = await self.speech_service.synthesize_speech(sentence, response_style)
+        
+        workers = [asyncio.create_task(_worker()) for _ in range(self.speech_service.pool.size)]
+        text_parts: List[str] = []
+        pending = ""
+        count = 0
+        try:
+            async for delta in self.openai_service.stream_response(messages):
+                text_parts.append(delta)
+                *complete, pending = SENTENCE_END.split(pending + delta)
+                for sentence in complete:
+                    if sentence.strip():
+                        sentences.put_nowait((count, sentence))
+                        count += 1
+            if pending.strip():
+                sentences.put_nowait((count, pending))
+                count += 1
+        finally:
+            for _ in workers:
+                sentences.put_nowait(None)
+        
+        async def _assemble() -> Optional[bytes]:
+            await asyncio.gather(*workers)
+            return _join_wav([audio_parts[i] for i in range(count)]) if count else None
+        
+        return "".join(text_parts), _assemble()
+    
     async def generate_enhanced_response(self, messages: List[Dict], 
                                        response_style: str = "empathetic",
                                        target_language: str = None) -> Dict:
-        """Generate enhanced response using all available Azure services"""
+        """Generate enhanced response using all available Azure services
+        
+        Text is returned as soon as OpenAI answers; audio_response and translated_response
+        are asyncio.Task handles (resolving to the result, or None on failure). Callers must
+        await them before serializing the response, or cancel them if it is abandoned.
+        """
         try:
             response_data = {
                 'text_response': None,
@@ -452,9 +1083,34 @@ class RudhAzureIntegration:
                 'services_used': []
             }
             
+            # Services whose circuit is open are skipped until their cooldown ends
+            openai_ready = (self.services_status['openai'] and self.openai_service
+                            and not self.openai_service.breaker.is_open())
+            speech_ready = (self.services_status['speech'] and self.speech_service
+                            and not self.speech_service.breaker.is_open())
+            translator_ready = (self.services_status['translator'] and self.translator_service
+                                and not self.translator_service.breaker.is_open())
+            
+            # With speech available, synthesis overlaps generation sentence by sentence
+            if openai_ready and speech_ready:
+                text, assemble_audio = await self.openai_service.breaker.call(
+                    self._stream_text_and_speech(messages, response_style)
+                )
+                response_data['text_response'] = text
+                response_data['generation_metadata']['openai'] = {
+                    'usage': None,
+                    'model': self.openai_service.deployment_name,
+                    'streamed': True
+                }
+                response_data['services_used'].append('openai')
+                response_data['audio_response'] = asyncio.create_task(self._background(
+                    'speech', self.speech_service.breaker.call(assemble_audio), response_data['services_used']
+                ))
+            
             # Generate text response with OpenAI
-            if self.services_status['openai'] and self.openai_service:
-                text_result = await self.openai_service.generate_response(messages)
+            elif openai_ready:
+                # Bursts of concurrent conversations are coalesced into shared requests
+                text_result = await self.openai_service.breaker.call(self.batch_processor.submit(messages))
                 response_data['text_response'] = text_result['content']
                 response_data['generation_metadata']['openai'] = {
                     'usage': text_result.get('usage'),
@@ -462,31 +1118,26 @@ class RudhAzureIntegration:
                 }
                 response_data['services_used'].append('openai')
             
-            # Generate audio response if speech service available
-            if (self.services_status['speech'] and self.speech_service and 
+            # Generate audio response in the background if speech service available
+            if (speech_ready and response_data['audio_response'] is None and 
                 response_data['text_response']):
-                try:
-                    audio_data = await self.speech_service.synthesize_speech(
-                        response_data['text_response'], 
-                        response_style
-                    )
-                    response_data['audio_response'] = audio_data
-                    response_data['services_used'].append('speech')
-                except Exception as e:
-                    self.logger.warning(f"Speech synthesis failed: {e}")
-            
-            # Translate response if requested and translator available
-            if (target_language and self.services_status['translator'] and 
-                self.translator_service and response_data['text_response']):
-                try:
-                    translation_result = await self.translator_service.translate_text(
-                        response_data['text_response'],
-                        target_language
-                    )
-                    response_data['translated_response'] = translation_result
-                    response_data['services_used'].append('translator')
-                except Exception as e:
-                    self.logger.warning(f"Translation failed: {e}")
+                response_data['audio_response'] = asyncio.create_task(self._background(
+                    'speech',
+                    self.speech_service.breaker.call(
+                        self.speech_service.synthesize_speech(response_data['text_response'], response_style)
+                    ),
+                    response_data['services_used']
+                ))
+            
+            # Translate in the background if requested and translator available
+            if target_language and translator_ready and response_data['text_response']:
+                response_data['translated_response'] = asyncio.create_task(self._background(
+                    'translator',
+                    self.translator_service.breaker.call(
+                        self.translator_service.translate_text(response_data['text_response'], target_language)
+                    ),
+                    response_data['services_used']
+                ))
             
             return response_data
             
@@ -501,56 +1152,60 @@ class RudhAzureIntegration:
             'total_services': len(self.services_status),
             'active_services': sum(self.services_status.values()),
             'availability_percentage': (sum(self.services_status.values()) / len(self.services_status)) * 100,
-            'timestamp': datetime.now().isoformat()
+            'circuit_breakers': {
+                service.breaker.name: service.breaker.state
+                for service in (self.openai_service, self.speech_service, self.translator_service)
+                if service
+            },
+            'timestamp': _iso_now()
         }
     
-    async def health_check(self) -> Dict:
-        """Perform health check on all services"""
+    async def _probe_openai(self):
+        await self.openai_service.generate_response([{"role": "user", "content": "."}], max_tokens=1)
+    
+    async def _probe_speech(self):
+        await self.speech_service.synthesize_speech(".", "friendly")
+    
+    async def _probe_translator(self):
+        await self.translator_service.translate_text(".", "ta")
+    
+    async def health_check(self, ttl: float = 30.0) -> Dict:
+        """Perform health check on all services (probes run concurrently, result cached for ttl seconds)"""
+        if self._hc_cache and time.monotonic() - self._hc_cache[0] < ttl:
+            return self._hc_cache[1]
+        
         health_status = {}
         
         try:
-            # Check OpenAI service
-            if self.openai_service:
-                try:
-                    test_messages = [{"role": "user", "content": "Health check"}]
-                    await self.openai_service.generate_response(test_messages, max_tokens=5)
-                    health_status['openai'] = 'healthy'
-                except Exception as e:
-                    health_status['openai'] = f'unhealthy: {str(e)[:100]}'
-            else:
-                health_status['openai'] = 'not_initialized'
-            
-            # Check Speech service
-            if self.speech_service:
-                try:
-                    await self.speech_service.synthesize_speech("Test", "friendly")
-                    health_status['speech'] = 'healthy'
-                except Exception as e:
-                    health_status['speech'] = f'unhealthy: {str(e)[:100]}'
-            else:
-                health_status['speech'] = 'not_initialized'
-            
-            # Check Translator service
-            if self.translator_service:
-                try:
-                    await self.translator_service.translate_text("Test", "ta")
-                    health_status['translator'] = 'healthy'
-                except Exception as e:
-                    health_status['translator'] = f'unhealthy: {str(e)[:100]}'
-            else:
-                health_status['translator'] = 'not_initialized'
+            probes = {
+                'openai': (self.openai_service, self._probe_openai),
+                'speech': (self.speech_service, self._probe_speech),
+                'translator': (self.translator_service, self._probe_translator)
+            }
+            active = [name for name, (service, _) in probes.items() if service]
+            results = await asyncio.gather(*(probes[name][1]() for name in active), return_exceptions=True)
             
-            return {
-                'overall_health': 'healthy' if all('healthy' in status for status in health_status.values()) else 'degraded',
+            for name in probes:
+                health_status[name] = 'not_initialized'
+            for name, result in zip(active, results):
+                if isinstance(result, Exception):
+                    health_status[name] = f'unhealthy: {str(result)[:100]}'
+                else:
+                    health_status[name] = 'healthy'
+            
+            result = {
+                'overall_health': 'healthy' if all(status == 'healthy' for status in health_status.values()) else 'degraded',
                 'service_details': health_status,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _iso_now()
             }
+            self._hc_cache = (time.monotonic(), result)
+            return result
             
         except Exception as e:
             return {
                 'overall_health': 'unhealthy',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _iso_now()
             }
 
 # Configuration helper
@@ -573,7 +1228,9 @@ class AzureConfigBuilder:
             speech_region=os.getenv('RUDH_SPEECH_REGION', 'southeastasia'),
             translator_key=os.getenv('RUDH_TRANSLATOR_KEY', ''),
             search_endpoint=os.getenv('RUDH_SEARCH_ENDPOINT', ''),
-            search_key=os.getenv('RUDH_SEARCH_KEY', '')
+            search_key=os.getenv('RUDH_SEARCH_KEY', ''),
+            warmup=os.getenv('RUDH_WARMUP', 'true' if os.getenv('RUDH_ENV') == 'production' else 'false').lower() == 'true',
+            rate_limit_rpm=int(os.environ['RATE_LIMIT_RPM']) if os.getenv('RATE_LIMIT_RPM') else None
         )
     
     @staticmethod
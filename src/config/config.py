@@ -2,185 +2,380 @@
 Configuration management for Rudh AI Companion
 Enhanced with multi-region Azure services
 """
-import os
-from typing import Dict, Optional
+import functools
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 
-class RudhConfig:
-    """Configuration management for Rudh"""
+from . import envs
+
+try:
+    from azure.identity import DefaultAzureCredential
+    from azure.keyvault.secrets import SecretClient
+    AZURE_KEYVAULT_AVAILABLE = True
+except ImportError:
+    AZURE_KEYVAULT_AVAILABLE = False
+
+# Key Vault secrets used when a credential is missing from the environment
+_KEYVAULT_SECRETS = {
+    "openai_api_key": "rudh-openai-key",
+    "speech_key": "rudh-speech-key",
+    "translator_key": "rudh-translator-key"
+}
+
+def _freeze(value):
+    """Read-only view of nested config dicts"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+def _merge(base: Dict, overrides: Dict) -> Dict:
+    """Copy of base with overrides applied recursively"""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            merged[key] = _merge(base[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+# Environment-specific overrides
+_PROD_OVERRIDES = {
+    "development": {
+        "debug_mode": False,
+        "test_mode": False,
+        "mock_responses": False,
+        "log_level": "WARNING"
+    },
+    "api": {
+        "reload": False,
+        "cors_origins": ["https://yourdomain.com"]
+    }
+}
+
+# Staging mirrors production but keeps informational logging
+_STAGING_OVERRIDES = _merge(_PROD_OVERRIDES, {"development": {"log_level": "INFO"}})
+
+_OVERRIDES = {
+    "production": _PROD_OVERRIDES,
+    "staging": _STAGING_OVERRIDES
+}
+
+# Region names repeat across sections; share one string object each
+_SEA = sys.intern("southeastasia")
+_EUS2 = sys.intern("eastus2")
+
+# Fallbacks for endpoints left unset in the environment
+_DEFAULT_OAI_EP = sys.intern("https://oai-rudh-core-dev-eus2.openai.azure.com/")
+_DEFAULT_KV_URL = sys.intern("https://kv-rudh-secrets-sea.vault.azure.net/")
+
+@dataclass(frozen=True, slots=True)
+class OpenAIConfig:
+    """OpenAI Configuration (East US 2)"""
+    endpoint: str
+    api_key: Optional[str]
+    deployment_gpt4o: str
+    deployment_gpt4: str
+    api_version: str = "2024-05-01-preview"
+    region: str = _EUS2
+    primary_model: str = "gpt4o"
     
-    @staticmethod
-    def get_config(environment: str = "development") -> Dict:
-        """Get configuration based on environment"""
-        
-        base_config = {
-            "azure": {
-                # Multi-region setup: OpenAI in East US 2, Speech in Southeast Asia
-                "regions": {
-                    "primary": "southeastasia",
-                    "ai_models": "eastus2"
-                },
-                
-                # OpenAI Configuration (East US 2)
-                "openai": {
-                    "endpoint": os.getenv("AZURE_OPENAI_ENDPOINT", "https://oai-rudh-core-dev-eus2.openai.azure.com/"),
-                    "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
-                    "api_version": "2024-05-01-preview",
-                    "region": "eastus2",
-                    "deployments": {
-                        "gpt4o": os.getenv("AZURE_OPENAI_DEPLOYMENT_GPT4O", "rudh-gpt4o"),
-                        "gpt4": os.getenv("AZURE_OPENAI_DEPLOYMENT_GPT4", "rudh-gpt4"),
-                        "primary_model": "gpt4o"
-                    }
-                },
-                
-                # Speech Services Configuration (Southeast Asia)
-                "speech": {
-                    "key": os.getenv("AZURE_SPEECH_KEY"),
-                    "region": os.getenv("AZURE_SPEECH_REGION", "southeastasia"),
-                    "endpoint": "https://southeastasia.api.cognitive.microsoft.com/",
-                    "voice": os.getenv("AZURE_SPEECH_VOICE", "en-IN-NeerjaNeural"),
-                    "rate": "medium",
-                    "pitch": "medium",
-                    "style": "friendly"
-                },
-                
-                # Translator Configuration (Southeast Asia)
-                "translator": {
-                    "key": os.getenv("AZURE_TRANSLATOR_KEY"),
-                    "region": "southeastasia",
-                    "endpoint": "https://api.cognitive.microsofttranslator.com/"
-                },
-                
-                # Key Vault Configuration
-                "key_vault": {
-                    "name": os.getenv("AZURE_KEYVAULT_NAME", "kv-rudh-secrets-sea"),
-                    "url": os.getenv("AZURE_KEYVAULT_URL", "https://kv-rudh-secrets-sea.vault.azure.net/"),
-                    "region": "southeastasia"
-                }
-            },
-            
-            "rudh": {
-                "name": "Rudh",
-                "version": "2.3.0",  # Updated to reflect Phase 2.3
-                "personality": "empathetic_intelligent_companion",
-                "primary_languages": ["tamil", "english"],
-                "response_style": "warm_professional",
-                "memory_limit": 50,
-                "max_response_tokens": 500,
-                "temperature": 0.7,
-                
-                # Enhanced capabilities
-                "features": {
-                    "azure_openai": True,
-                    "speech_synthesis": True,
-                    "real_time_translation": True,
-                    "emotional_intelligence": True,
-                    "context_awareness": True,
-                    "user_profiling": True
-                }
-            },
-            
-            "development": {
-                "log_level": os.getenv("LOG_LEVEL", "INFO"),
-                "debug_mode": os.getenv("DEBUG_MODE", "true").lower() == "true",
-                "test_mode": False,
-                "mock_responses": os.getenv("MOCK_RESPONSES", "true").lower() == "true",
-                "azure_fallback": True  # Enable graceful fallback when Azure unavailable
-            },
-            
-            "api": {
-                "host": "0.0.0.0",
-                "port": int(os.getenv("PORT", "8000")),
-                "reload": True,
-                "cors_origins": ["*"],  # Restrict in production
-                "rate_limit": {
-                    "requests_per_minute": 60,
-                    "burst_limit": 10
-                }
-            },
-            
-            # Performance and monitoring
-            "performance": {
-                "response_timeout": 30,
-                "max_retries": 3,
-                "health_check_interval": 300,  # 5 minutes
-                "metrics_enabled": True
+    def as_dict(self) -> Dict:
+        return {
+            "endpoint": self.endpoint,
+            "api_key": self.api_key,
+            "api_version": self.api_version,
+            "region": self.region,
+            "deployments": {
+                "gpt4o": self.deployment_gpt4o,
+                "gpt4": self.deployment_gpt4,
+                "primary_model": self.primary_model
             }
         }
-        
-        # Environment-specific overrides
-        if environment == "production":
-            base_config["development"]["debug_mode"] = False
-            base_config["development"]["test_mode"] = False
-            base_config["development"]["mock_responses"] = False
-            base_config["api"]["reload"] = False
-            base_config["api"]["cors_origins"] = ["https://yourdomain.com"]
-            base_config["development"]["log_level"] = "WARNING"
-        
-        return base_config
+
+@dataclass(frozen=True, slots=True)
+class SpeechConfig:
+    """Speech Services Configuration (Southeast Asia)"""
+    key: Optional[str]
+    region: str
+    voice: str
+    endpoint: str = "https://southeastasia.api.cognitive.microsoft.com/"
+    rate: str = "medium"
+    pitch: str = "medium"
+    style: str = "friendly"
     
-    @staticmethod
-    def get_azure_credentials() -> Dict:
-        """Get Azure credentials from environment or Key Vault"""
-        return {
-            "openai_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
-            "openai_api_key": os.getenv("AZURE_OPENAI_API_KEY"),
-            "speech_key": os.getenv("AZURE_SPEECH_KEY"),
-            "translator_key": os.getenv("AZURE_TRANSLATOR_KEY"),
-            "keyvault_url": os.getenv("AZURE_KEYVAULT_URL")
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass(frozen=True, slots=True)
+class TranslatorConfig:
+    """Translator Configuration (Southeast Asia)"""
+    key: Optional[str]
+    region: str = _SEA
+    endpoint: str = "https://api.cognitive.microsofttranslator.com/"
+    
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass(frozen=True, slots=True)
+class KeyVaultConfig:
+    """Key Vault Configuration"""
+    name: str
+    url: str
+    region: str = _SEA
+    
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass(frozen=True, slots=True)
+class AzureSections:
+    openai: OpenAIConfig
+    speech: SpeechConfig
+    translator: TranslatorConfig
+    key_vault: KeyVaultConfig
+
+@functools.lru_cache(maxsize=1)
+def _azure_sections() -> AzureSections:
+    """Typed Azure sections, built once per environment snapshot"""
+    return AzureSections(
+        openai=OpenAIConfig(
+            endpoint=envs.AZURE_OPENAI_ENDPOINT or _DEFAULT_OAI_EP,
+            api_key=envs.AZURE_OPENAI_API_KEY,
+            deployment_gpt4o=envs.AZURE_OPENAI_DEPLOYMENT_GPT4O,
+            deployment_gpt4=envs.AZURE_OPENAI_DEPLOYMENT_GPT4
+        ),
+        speech=SpeechConfig(
+            key=envs.AZURE_SPEECH_KEY,
+            region=sys.intern(envs.AZURE_SPEECH_REGION),
+            voice=envs.AZURE_SPEECH_VOICE
+        ),
+        translator=TranslatorConfig(key=envs.AZURE_TRANSLATOR_KEY),
+        key_vault=KeyVaultConfig(
+            name=envs.AZURE_KEYVAULT_NAME,
+            url=envs.AZURE_KEYVAULT_URL or _DEFAULT_KV_URL
+        )
+    )
+
+@functools.lru_cache(maxsize=1)
+def _base_template() -> Dict:
+    """Shared base configuration, built once per environment snapshot"""
+    sections = _azure_sections()
+    return {
+        "azure": {
+            # Multi-region setup: OpenAI in East US 2, Speech in Southeast Asia
+            "regions": {
+                "primary": _SEA,
+                "ai_models": _EUS2
+            },
+
+            "openai": sections.openai.as_dict(),
+            "speech": sections.speech.as_dict(),
+            "translator": sections.translator.as_dict(),
+            "key_vault": sections.key_vault.as_dict()
+        },
+
+        "rudh": {
+            "name": "Rudh",
+            "version": "2.3.0",  # Updated to reflect Phase 2.3
+            "personality": "empathetic_intelligent_companion",
+            "primary_languages": ["tamil", "english"],
+            "response_style": "warm_professional",
+            "memory_limit": 50,
+            "max_response_tokens": 500,
+            "temperature": 0.7,
+
+            # Enhanced capabilities
+            "features": {
+                "azure_openai": True,
+                "speech_synthesis": True,
+                "real_time_translation": True,
+                "emotional_intelligence": True,
+                "context_awareness": True,
+                "user_profiling": True
+            }
+        },
+
+        "development": {
+            "log_level": envs.LOG_LEVEL,
+            "debug_mode": envs.DEBUG_MODE,
+            "test_mode": False,
+            "mock_responses": envs.MOCK_RESPONSES,
+            "azure_fallback": True  # Enable graceful fallback when Azure unavailable
+        },
+
+        "api": {
+            "host": "0.0.0.0",
+            "port": envs.PORT,
+            "reload": True,
+            "keep_alive_timeout": 75,  # Outlive client idle gaps between /chat turns
+            "limit_concurrency": 256,
+            "backlog": 2048,
+            "cors_origins": ["*"],  # Restrict in production
+            "rate_limit": {
+                "requests_per_minute": envs.RATE_LIMIT_RPM,
+                "burst_limit": 10
+            }
+        },
+
+        # Performance and monitoring
+        "performance": {
+            "response_timeout": envs.RESPONSE_TIMEOUT,
+            "max_retries": envs.MAX_RETRIES,
+            "health_check_interval": 300,  # 5 minutes
+            "metrics_enabled": True
         }
+    }
+
+@functools.lru_cache(maxsize=4)
+def _build_config(environment: str) -> Mapping:
+    """Build the configuration for one environment (cached for the life of the process)"""
+    return _freeze(_merge(_base_template(), _OVERRIDES.get(environment, {})))
+
+# Sections every configuration must provide, as key paths
+_REQUIRED_PATHS = (
+    ("azure",),
+    ("rudh",),
+    ("development",),
+    ("azure", "openai"),
+    ("azure", "speech"),
+    ("azure", "key_vault")
+)
+
+def _has_path(config: Mapping, path: Tuple[str, ...]) -> bool:
+    for key in path:
+        if not isinstance(config, Mapping) or key not in config:
+            return False
+        config = config[key]
+    return True
+
+# Secrets fetched successfully, per (vault, name); failed lookups are not cached so they retry
+_KEYVAULT_SECRET_CACHE: Dict[Tuple[str, str], str] = {}
+
+def _load_secrets_from_keyvault(keyvault_url: str, names: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+    """Fetch several Key Vault secrets concurrently, reusing ones already fetched from this vault"""
+    if not AZURE_KEYVAULT_AVAILABLE or not names:
+        return {}
     
-    @staticmethod
-    def get_openai_config() -> Dict:
-        """Get OpenAI specific configuration"""
-        config = RudhConfig.get_config()
-        return config["azure"]["openai"]
+    secrets = {name: _KEYVAULT_SECRET_CACHE.get((keyvault_url, name)) for name in names}
+    pending = [name for name, value in secrets.items() if value is None]
+    if not pending:
+        return secrets
     
-    @staticmethod
-    def get_speech_config() -> Dict:
-        """Get Speech Services configuration"""
-        config = RudhConfig.get_config()
-        return config["azure"]["speech"]
+    client = SecretClient(
+        vault_url=keyvault_url,
+        credential=DefaultAzureCredential(exclude_interactive_browser_credential=True)
+    )
     
-    @staticmethod
-    def get_keyvault_config() -> Dict:
-        """Get Key Vault configuration"""
-        config = RudhConfig.get_config()
-        return config["azure"]["key_vault"]
+    def _fetch(name: str) -> Optional[str]:
+        try:
+            return client.get_secret(name).value
+        except Exception:
+            return None
     
-    @staticmethod
-    def validate_config(config: Dict) -> bool:
-        """Validate configuration completeness"""
-        required_keys = ["azure", "rudh", "development"]
-        
-        for key in required_keys:
-            if key not in config:
-                return False
-        
-        # Validate Azure configuration
-        azure_config = config.get("azure", {})
-        required_azure_keys = ["openai", "speech", "key_vault"]
-        
-        for key in required_azure_keys:
-            if key not in azure_config:
-                return False
-        
-        return True
+    # The first request settles the auth challenge and token; the rest reuse it in parallel
+    first, *rest = pending
+    values = [_fetch(first)]
+    if rest:
+        with ThreadPoolExecutor(max_workers=len(rest)) as pool:
+            values.extend(pool.map(_fetch, rest))
     
-    @staticmethod
-    def get_azure_status() -> Dict:
-        """Get Azure services availability status"""
-        credentials = RudhConfig.get_azure_credentials()
-        
-        return {
-            "openai_configured": bool(credentials.get("openai_endpoint") and credentials.get("openai_api_key")),
-            "speech_configured": bool(credentials.get("speech_key")),
-            "translator_configured": bool(credentials.get("translator_key")),
-            "keyvault_configured": bool(credentials.get("keyvault_url")),
-            "multi_region_setup": True
-        }
+    for name, value in zip(pending, values):
+        secrets[name] = value
+        if value is not None:
+            _KEYVAULT_SECRET_CACHE[(keyvault_url, name)] = value
+    return secrets
+
+def get_config(environment: str = "development") -> Mapping:
+    """Get configuration based on environment
+
+    The result is a shared read-only mapping (nested sections included), so callers
+    need no defensive copies; use dict(config[...]) for a mutable section.
+    """
+    return _build_config(environment)
+
+def reload():
+    """Re-read environment variables and rebuild configuration on next access"""
+    envs.reload()
+    invalidate()
+
+def invalidate():
+    """Drop every cached config value (without re-reading the environment)"""
+    _azure_sections.cache_clear()
+    _base_template.cache_clear()
+    _build_config.cache_clear()
+    _KEYVAULT_SECRET_CACHE.clear()
+    get_azure_status.cache_clear()
+
+def get_azure_sections() -> AzureSections:
+    """Get typed, immutable Azure service sections"""
+    return _azure_sections()
+
+def get_azure_credentials() -> Dict:
+    """Get Azure credentials from environment or Key Vault"""
+    credentials = {
+        "openai_endpoint": envs.AZURE_OPENAI_ENDPOINT,
+        "openai_api_key": envs.AZURE_OPENAI_API_KEY,
+        "speech_key": envs.AZURE_SPEECH_KEY,
+        "translator_key": envs.AZURE_TRANSLATOR_KEY,
+        "keyvault_url": envs.AZURE_KEYVAULT_URL
+    }
+
+    # Fill any missing keys from Key Vault in one concurrent round
+    missing = tuple(name for key, name in _KEYVAULT_SECRETS.items() if not credentials[key])
+    if missing and credentials["keyvault_url"]:
+        secrets = _load_secrets_from_keyvault(credentials["keyvault_url"], missing)
+        for key, name in _KEYVAULT_SECRETS.items():
+            if not credentials[key] and secrets.get(name):
+                credentials[key] = secrets[name]
+
+    return credentials
+
+def get_openai_config() -> Mapping:
+    """Get OpenAI specific configuration (read-only mapping)"""
+    return _build_config("development")["azure"]["openai"]
+
+def get_speech_config() -> Mapping:
+    """Get Speech Services configuration (read-only mapping)"""
+    return _build_config("development")["azure"]["speech"]
+
+def get_keyvault_config() -> Mapping:
+    """Get Key Vault configuration (read-only mapping)"""
+    return _build_config("development")["azure"]["key_vault"]
+
+def validate_config(config: Mapping) -> bool:
+    """Validate configuration completeness"""
+    return all(_has_path(config, path) for path in _REQUIRED_PATHS)
+
+@functools.lru_cache(maxsize=1)
+def get_azure_status() -> Mapping:
+    """Get Azure services availability status (from the environment snapshot; no Key Vault calls)"""
+    return MappingProxyType({
+        "openai_configured": bool(envs.AZURE_OPENAI_ENDPOINT and envs.AZURE_OPENAI_API_KEY),
+        "speech_configured": bool(envs.AZURE_SPEECH_KEY),
+        "translator_configured": bool(envs.AZURE_TRANSLATOR_KEY),
+        "keyvault_configured": bool(envs.AZURE_KEYVAULT_URL),
+        "multi_region_setup": True
+    })
+
+# Backward compatibility: class-style access used across the codebase
+class RudhConfig:
+    """Configuration management for Rudh (stateless; delegates to the module functions)"""
+    
+    __slots__ = ()
+    
+    def __new__(cls, *args, **kwargs):
+        raise TypeError("RudhConfig is stateless; call its static methods instead")
+    
+    get_config = staticmethod(get_config)
+    reload = staticmethod(reload)
+    invalidate = staticmethod(invalidate)
+    get_azure_sections = staticmethod(get_azure_sections)
+    get_azure_credentials = staticmethod(get_azure_credentials)
+    get_openai_config = staticmethod(get_openai_config)
+    get_speech_config = staticmethod(get_speech_config)
+    get_keyvault_config = staticmethod(get_keyvault_config)
+    validate_config = staticmethod(validate_config)
+    get_azure_status = staticmethod(get_azure_status)
 
-# Backward compatibility
-def get_config(environment: str = "development") -> Dict:
-    """Backward compatible function"""
-    return RudhConfig.get_config(environment)
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Environment variables for Rudh AI Companion
+Read once at import; call reload() after changing os.environ (e.g. load_dotenv)
+"""
+import os
+from typing import Optional
+
+# Bound once; still sees later changes to os.environ
+_env = os.environ.get
+
+_TRUE = frozenset({"1", "true", "yes", "on", "y", "t"})
+
+def _as_bool(value: Optional[str], default: bool = False) -> bool:
+    if value is None:
+        return default
+    return value.lower() in _TRUE if isinstance(value, str) else bool(value)
+
+class ConfigError(ValueError):
+    """An environment variable holds a value of the wrong type"""
+
+def _parse_int(name: str, value: Optional[str], default: int) -> int:
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ConfigError(f"{name} must be int, got {value!r}") from None
+
+def reload():
+    """Re-snapshot every variable from os.environ"""
+    global AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY
+    global AZURE_OPENAI_DEPLOYMENT_GPT4O, AZURE_OPENAI_DEPLOYMENT_GPT4
+    global AZURE_SPEECH_KEY, AZURE_SPEECH_REGION, AZURE_SPEECH_VOICE
+    global AZURE_TRANSLATOR_KEY, AZURE_KEYVAULT_NAME, AZURE_KEYVAULT_URL
+    global LOG_LEVEL, DEBUG_MODE, MOCK_RESPONSES, PORT
+    global RATE_LIMIT_RPM, MAX_RETRIES, RESPONSE_TIMEOUT
+
+    # Azure OpenAI
+    AZURE_OPENAI_ENDPOINT = _env("AZURE_OPENAI_ENDPOINT")
+    AZURE_OPENAI_API_KEY = _env("AZURE_OPENAI_API_KEY")
+    AZURE_OPENAI_DEPLOYMENT_GPT4O = _env("AZURE_OPENAI_DEPLOYMENT_GPT4O", "rudh-gpt4o")
+    AZURE_OPENAI_DEPLOYMENT_GPT4 = _env("AZURE_OPENAI_DEPLOYMENT_GPT4", "rudh-gpt4")
+
+    # Speech and Translator
+    AZURE_SPEECH_KEY = _env("AZURE_SPEECH_KEY")
+    AZURE_SPEECH_REGION = _env("AZURE_SPEECH_REGION", "southeastasia")
+    AZURE_SPEECH_VOICE = _env("AZURE_SPEECH_VOICE", "en-IN-NeerjaNeural")
+    AZURE_TRANSLATOR_KEY = _env("AZURE_TRANSLATOR_KEY")
+
+    # Key Vault (the URL stays None when unset; get_azure_status checks for it)
+    AZURE_KEYVAULT_NAME = _env("AZURE_KEYVAULT_NAME", "kv-rudh-secrets-sea")
+    AZURE_KEYVAULT_URL = _env("AZURE_KEYVAULT_URL")
+
+    # Development and API
+    LOG_LEVEL = _env("LOG_LEVEL", "INFO")
+    DEBUG_MODE = _as_bool(_env("DEBUG_MODE"), True)
+    MOCK_RESPONSES = _as_bool(_env("MOCK_RESPONSES"), True)
+    PORT = _parse_int("PORT", _env("PORT"), 8000)
+    RATE_LIMIT_RPM = _parse_int("RATE_LIMIT_RPM", _env("RATE_LIMIT_RPM"), 60)
+    MAX_RETRIES = _parse_int("MAX_RETRIES", _env("MAX_RETRIES"), 3)
+    RESPONSE_TIMEOUT = _parse_int("RESPONSE_TIMEOUT", _env("RESPONSE_TIMEOUT"), 30)
+
+reload()
@@ -6,46 +6,52 @@ Enhanced emotion detection and context-aware AI companion
 __version__ = "2.2.0"
 __author__ = "Rudh AI Project"
 
-# Import Phase 2.2 components
-try:
-    from .emotion_engine import EnhancedEmotionEngine
-    from .context_engine import AdvancedContextEngine, ConversationContext, ResponseStrategy
-    from .core import EnhancedRudhCore
-    
-    # Backward compatibility - alias old names to new ones
-    RudhCore = EnhancedRudhCore  # For backward compatibility
-    
-    __all__ = [
-        'EnhancedEmotionEngine',
-        'AdvancedContextEngine', 
-        'ConversationContext',
-        'ResponseStrategy',
-        'EnhancedRudhCore',
-        'RudhCore'  # Backward compatibility
-    ]
-    
-except ImportError as e:
-    print(f"Warning: Could not import some Rudh components: {e}")
-    __all__ = []
+import importlib
+from types import MappingProxyType
+
+# Phase 2.2 components, imported on first access (PEP 562) so `import rudh_core` stays cheap
+_LAZY = {
+    'EnhancedEmotionEngine': ('emotion_engine', 'EnhancedEmotionEngine'),
+    'AdvancedContextEngine': ('context_engine', 'AdvancedContextEngine'),
+    'ConversationContext': ('context_engine', 'ConversationContext'),
+    'ResponseStrategy': ('context_engine', 'ResponseStrategy'),
+    'EnhancedRudhCore': ('core', 'EnhancedRudhCore'),
+    'RudhCore': ('core', 'RudhCore'),  # Backward compatibility alias defined in core
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 # Package information
 def get_version():
     """Get the current version of Rudh AI"""
     return __version__
 
+_INFO = MappingProxyType({
+    'name': 'Rudh AI Companion',
+    'version': __version__,
+    'description': 'Advanced emotion detection and context-aware AI companion',
+    'phase': '2.2 - Context-Aware Response Generation',
+    'features': (
+        '16+ emotion types with confidence scoring',
+        'Advanced context analysis (7 topic categories)',
+        'Intelligent response strategies (5 types)',
+        'Multi-turn conversation awareness',
+        'User personality learning',
+        'Real-time performance analytics'
+    )
+})
+
 def get_info():
-    """Get package information"""
-    return {
-        'name': 'Rudh AI Companion',
-        'version': __version__,
-        'description': 'Advanced emotion detection and context-aware AI companion',
-        'phase': '2.2 - Context-Aware Response Generation',
-        'features': [
-            '16+ emotion types with confidence scoring',
-            'Advanced context analysis (7 topic categories)',
-            'Intelligent response strategies (5 types)',
-            'Multi-turn conversation awareness',
-            'User personality learning',
-            'Real-time performance analytics'
-        ]
-    }
\ No newline at end of file
+    """Get package information (shared, read-only)"""
+    return _INFO
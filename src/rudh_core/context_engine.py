@@ -8,11 +8,99 @@ import time
 import logging
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, FrozenSet, Mapping
 from collections import defaultdict, deque
+from functools import lru_cache
+from types import MappingProxyType
 import re
+import sys
 
-@dataclass
+from cachetools import LRUCache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+_WORD_RE = re.compile(r"[a-z]+")
+# Goal patterns of the form \bplain words\b can be matched as literals
+_BOUNDED_LITERAL_RE = re.compile(r"\\b([a-z ]+)\\b")
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+def _is_token_char(ch: str) -> bool:
+    return 'a' <= ch <= 'z'
+
+def _bounded(text: str, start: int, end: int, is_word) -> bool:
+    """True when text[start:end] is not glued to a neighbouring word character"""
+    return ((start == 0 or not is_word(text[start - 1])) and
+            (end == len(text) or not is_word(text[end])))
+
+def _primary_emotion(emotion_data: Optional[Dict]) -> Optional[str]:
+    """Primary emotion, interned so table and cache lookups can match by identity"""
+    emotion = emotion_data.get('primary_emotion') if emotion_data else None
+    return sys.intern(emotion) if type(emotion) is str else emotion
+
+def _flatten(table: Dict[str, Dict[str, float]]) -> Mapping[Tuple[str, str], float]:
+    """{outer: {inner: v}} -> read-only {(outer, inner): v}, one hash per lookup"""
+    return MappingProxyType({(outer, inner): value
+                             for outer, row in table.items()
+                             for inner, value in row.items()})
+
+# Tones that _adjust_tone_for_context may add on top of a strategy's own
+_CONTEXT_TONES = ('professionalism', 'friendliness', 'responsiveness', 'clarity', 'empathy', 'warmth')
+
+# Strategy scoring tables, keyed (emotion, strategy)
+_EMOTION_STRATEGY_FIT = _flatten({
+    'frustrated': {'supportive': 0.7, 'analytical': 0.3},
+    'sad': {'supportive': 0.8, 'conversational': 0.2},
+    'anxious': {'supportive': 0.7, 'analytical': 0.2},
+    'angry': {'supportive': 0.6, 'analytical': 0.3},
+    'grateful': {'conversational': 0.7, 'supportive': 0.3},
+    'excited': {'motivational': 0.6, 'conversational': 0.4},
+    'confused': {'educational': 0.7, 'analytical': 0.3},
+    'curious': {'educational': 0.8, 'analytical': 0.2},
+    'hopeful': {'motivational': 0.7, 'conversational': 0.3},
+    'disappointed': {'supportive': 0.7, 'motivational': 0.3},
+    'proud': {'conversational': 0.6, 'motivational': 0.4},
+    'neutral': {'conversational': 0.5, 'analytical': 0.3}
+})
+
+# Goals each strategy serves
+_GOAL_ALIGNMENT: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    'supportive': frozenset({'emotional_support', 'problem_solving'}),
+    'analytical': frozenset({'decision_making', 'problem_solving', 'planning'}),
+    'motivational': frozenset({'planning', 'problem_solving'}),
+    'educational': frozenset({'learning', 'problem_solving'}),
+    'conversational': frozenset({'conversation'})
+})
+
+# Keyed (strategy, urgency level)
+_URGENCY_PREFERENCE = _flatten({
+    'supportive': {'high': 0.2, 'medium': 0.15, 'low': 0.1},
+    'analytical': {'high': 0.1, 'medium': 0.2, 'low': 0.15},
+    'motivational': {'high': 0.1, 'medium': 0.2, 'low': 0.15}
+})
+
+# Keyed (topic, strategy)
+_TOPIC_STRATEGY_FIT = _flatten({
+    'work': {'analytical': 0.2, 'motivational': 0.15, 'supportive': 0.15},
+    'relationships': {'supportive': 0.2, 'conversational': 0.15},
+    'health': {'supportive': 0.2, 'analytical': 0.1},
+    'finance': {'analytical': 0.3, 'educational': 0.15},
+    'learning': {'educational': 0.3, 'motivational': 0.15},
+    'general': {'conversational': 0.1, 'supportive': 0.1}  # Added general topic
+})
+
+@dataclass(slots=True)
 class ConversationContext:
     """Represents conversation context state"""
     topic: str
@@ -25,7 +113,7 @@ class ConversationContext:
     key_entities: List[str]  # People, places, concepts mentioned
     user_preferences: Dict[str, float]  # Learned preferences with confidence
     
-@dataclass
+@dataclass(slots=True)
 class ResponseStrategy:
     """Defines how to respond based on context"""
     strategy_type: str
@@ -35,88 +123,88 @@ class ResponseStrategy:
     content_focus: List[str]
     follow_up_suggestions: List[str]
 
+@dataclass(frozen=True)
+class _InputView:
+    """One turn's input, lowercased, tokenized and scanned once for every helper"""
+    raw: str
+    lower: str
+    tokens: FrozenSet[str]
+    hits: Optional[Dict[str, Dict[str, set]]]  # Aho-Corasick scan, None without pyahocorasick
+
 class AdvancedContextEngine:
     """
     Advanced context understanding and response generation engine
     Provides multi-turn conversation awareness and intelligent response strategies
     """
 
+    # Goal detection patterns
+    goal_patterns = {
+        'seeking_advice': [r'\bwhat should i\b', r'\bshould i\b', r'\badvice\b', 
+                         r'\bwhat would you\b', r'\brecommend\b'],
+        'problem_solving': [r'\bhow to\b', r'\bhow can i\b', r'\bproblem with\b',
+                          r'\bissue with\b', r'\btrouble\b'],
+        'learning': [r'\blearn\b', r'\bunderstand\b', r'\bexplain\b', 
+                    r'\bteach me\b', r'\bhow does\b'],
+        'emotional_support': [r'\bfeeling\b', r'\bupset\b', r'\bstressed\b',
+                            r'\bneed support\b', r'\bhelp me cope\b'],
+        'planning': [r'\bplan\b', r'\bschedule\b', r'\borganize\b',
+                    r'\bprepare for\b', r'\bstrategy\b'],
+        'decision_making': [r'\bdecide\b', r'\bchoose\b', r'\boptions\b',
+                          r'\bwhich one\b', r'\bcompare\b']
+    }
+
+    # Urgency keywords, checked in order: high before medium before low
+    urgency_keywords = {
+        'high': ['urgent', 'emergency', 'asap', 'immediately', 'crisis', 'critical'],
+        'medium': ['soon', 'important', 'need help', 'worried', 'concerned'],
+        'low': ['when you can', 'eventually', 'thinking about', 'wondering']
+    }
+
+    formal_indicators = ['please', 'would you', 'could you', 'i would appreciate']
+    casual_indicators = ["what's", "don't", "can't", "won't", 'hey', 'hi there']
+
+    # Simple entity extraction patterns, one named group per entity type
+    entity_pattern = (r'\b(?:'
+                      r'(?:my|a) (?P<person>friend|colleague|boss|partner|spouse|doctor|teacher)'
+                      r'|(?:at|in|to) (?P<place>work|home|school|hospital|office|gym)'
+                      r'|(?P<time>today|tomorrow|yesterday|this week|next month)'
+                      r')\b')
+
     def _score_strategy(self, strategy_name: str, strategy_config: Dict,
                        context: ConversationContext, emotion_data: Dict) -> float:
         """Score how well a strategy fits the current context - OPTIMIZED"""
+        return self._strategy_fit(strategy_name, strategy_config, _primary_emotion(emotion_data),
+                                  context.topic, context.urgency_level, context.user_goals)
+    
+    @staticmethod
+    def _strategy_fit(strategy_name: str, strategy_config: Dict, primary_emotion: Optional[str],
+                      topic: str, urgency: str, goals) -> float:
+        """Scalar strategy score from the context fields it actually depends on"""
         score = 0.0
         
-        # ENHANCED: Base score from emotion triggers (higher weight)
-        if emotion_data and 'primary_emotion' in emotion_data:
-            primary_emotion = emotion_data['primary_emotion']
+        if primary_emotion is not None:
+            # ENHANCED: Base score from emotion triggers (higher weight)
             if primary_emotion in strategy_config.get('triggers', []):
                 score += 0.6  # Increased from 0.4
-        
-        # ENHANCED: Emotion-strategy mapping for better selection
-        emotion_strategy_fit = {
-            'frustrated': {'supportive': 0.7, 'analytical': 0.3},
-            'sad': {'supportive': 0.8, 'conversational': 0.2},
-            'anxious': {'supportive': 0.7, 'analytical': 0.2},
-            'angry': {'supportive': 0.6, 'analytical': 0.3},
-            'grateful': {'conversational': 0.7, 'supportive': 0.3},
-            'excited': {'motivational': 0.6, 'conversational': 0.4},
-            'confused': {'educational': 0.7, 'analytical': 0.3},
-            'curious': {'educational': 0.8, 'analytical': 0.2},
-            'hopeful': {'motivational': 0.7, 'conversational': 0.3},
-            'disappointed': {'supportive': 0.7, 'motivational': 0.3},
-            'proud': {'conversational': 0.6, 'motivational': 0.4},
-            'neutral': {'conversational': 0.5, 'analytical': 0.3}
-        }
-        
-        if emotion_data and 'primary_emotion' in emotion_data:
-            primary_emotion = emotion_data['primary_emotion']
-            if primary_emotion in emotion_strategy_fit:
-                emotion_fit = emotion_strategy_fit[primary_emotion].get(strategy_name, 0)
-                score += emotion_fit
+            # ENHANCED: Emotion-strategy mapping for better selection
+            score += _EMOTION_STRATEGY_FIT.get((primary_emotion, strategy_name), 0)
         
         # Score based on user goals (reduced weight)
-        goal_alignment = {
-            'supportive': ['emotional_support', 'problem_solving'],
-            'analytical': ['decision_making', 'problem_solving', 'planning'],
-            'motivational': ['planning', 'problem_solving'],
-            'educational': ['learning', 'problem_solving'],
-            'conversational': ['conversation']
-        }
-        
-        strategy_goals = goal_alignment.get(strategy_name, [])
-        goal_matches = len(set(context.user_goals) & set(strategy_goals))
+        goal_matches = len(_GOAL_ALIGNMENT.get(strategy_name, frozenset()).intersection(goals))
         score += goal_matches * 0.15  # Reduced from 0.2
         
         # Urgency adjustment (reduced impact)
-        urgency_preference = {
-            'supportive': {'high': 0.2, 'medium': 0.15, 'low': 0.1},
-            'analytical': {'high': 0.1, 'medium': 0.2, 'low': 0.15},
-            'motivational': {'high': 0.1, 'medium': 0.2, 'low': 0.15}
-        }
-        
-        if strategy_name in urgency_preference:
-            score += urgency_preference[strategy_name].get(context.urgency_level, 0)
+        score += _URGENCY_PREFERENCE.get((strategy_name, urgency), 0)
         
         # Topic relevance (reduced impact)
-        topic_strategy_fit = {
-            'work': {'analytical': 0.2, 'motivational': 0.15, 'supportive': 0.15},
-            'relationships': {'supportive': 0.2, 'conversational': 0.15},
-            'health': {'supportive': 0.2, 'analytical': 0.1},
-            'finance': {'analytical': 0.3, 'educational': 0.15},
-            'learning': {'educational': 0.3, 'motivational': 0.15},
-            'general': {'conversational': 0.1, 'supportive': 0.1}  # Added general topic
-        }
-        
-        if context.topic in topic_strategy_fit:
-            score += topic_strategy_fit[context.topic].get(strategy_name, 0)
+        score += _TOPIC_STRATEGY_FIT.get((topic, strategy_name), 0)
         
         return min(score, 1.0)  # Cap at 1.0
     
     def __init__(self):
         self.conversation_history = deque(maxlen=50)  # Recent conversation
-        self.user_profile = self._initialize_user_profile()
         self.topic_transitions = deque(maxlen=20)
-        self.context_cache = {}
+        self.context_cache = LRUCache(maxsize=128)  # Bounded; oldest contexts evicted first
         self.learning_patterns = defaultdict(list)
         
         # Context classification patterns
@@ -165,6 +253,9 @@ class AdvancedContextEngine:
             }
         }
         
+        # Built after topic_patterns, which fix the topic interest layout
+        self.user_profile = self._initialize_user_profile()
+        
         # Response strategies
         self.response_strategies = {
             'supportive': {
@@ -199,6 +290,176 @@ class AdvancedContextEngine:
             }
         }
         
+        self._compile_patterns()
+        self._topic_index = None
+        if NUMPY_AVAILABLE:
+            self._build_strategy_matrices()
+            self._init_turn_log()
+        self._cached_strategy = lru_cache(maxsize=512)(self._select_strategy)
+        
+    def _init_turn_log(self):
+        """Column arrays mirroring conversation_history as a ring buffer of the same size"""
+        size = self.conversation_history.maxlen
+        self._topic_index = {name: i for i, name in enumerate([*self.topic_patterns, 'general'])}
+        self._hist_topic_id = np.zeros(size, dtype=np.int8)
+        self._hist_emotion_id = np.full(size, -1, dtype=np.int16)  # -1: no emotion given
+        self._hist_len = np.zeros(size, dtype=np.int16)  # words per input
+        self._emotion_vocab = {}
+        self._turns = 0
+        
+    def _build_strategy_matrices(self):
+        """Lay the scoring tables out as (row, strategy) arrays for one-shot scoring"""
+        self._strategy_names = list(self.response_strategies)
+        strategy_ids = {name: i for i, name in enumerate(self._strategy_names)}
+        emotions = {e for e, _ in _EMOTION_STRATEGY_FIT}
+        for config in self.response_strategies.values():
+            emotions.update(config.get('triggers', []))
+        self._emotion_ids = {e: i for i, e in enumerate(sorted(emotions))}
+        self._topic_ids = {t: i for i, t in enumerate(sorted({t for t, _ in _TOPIC_STRATEGY_FIT}))}
+        self._urgency_ids = {u: i for i, u in enumerate(sorted({u for _, u in _URGENCY_PREFERENCE}))}
+        self._goal_ids = {g: i for i, g in enumerate(sorted(set().union(*_GOAL_ALIGNMENT.values())))}
+        
+        n = len(self._strategy_names)
+        self._emo_strat_matrix = np.zeros((len(self._emotion_ids), n))
+        self._topic_strat_matrix = np.zeros((len(self._topic_ids), n))
+        self._urgency_strat_matrix = np.zeros((len(self._urgency_ids), n))
+        self._goal_strat_matrix = np.zeros((len(self._goal_ids), n))
+        
+        for emotion, row in self._emotion_ids.items():
+            for name, config in self.response_strategies.items():
+                # Trigger bonus first, then the fit, matching _score_strategy's order
+                trigger = 0.6 if emotion in config.get('triggers', []) else 0.0
+                self._emo_strat_matrix[row, strategy_ids[name]] = (
+                    trigger + _EMOTION_STRATEGY_FIT.get((emotion, name), 0))
+        for (topic, name), value in _TOPIC_STRATEGY_FIT.items():
+            if name in strategy_ids:
+                self._topic_strat_matrix[self._topic_ids[topic], strategy_ids[name]] = value
+        for (name, urgency), value in _URGENCY_PREFERENCE.items():
+            if name in strategy_ids:
+                self._urgency_strat_matrix[self._urgency_ids[urgency], strategy_ids[name]] = value
+        for name, goals in _GOAL_ALIGNMENT.items():
+            if name in strategy_ids:
+                for goal in goals:
+                    self._goal_strat_matrix[self._goal_ids[goal], strategy_ids[name]] = 1.0
+        
+        # Tone vocabulary: every strategy's tones plus the ones _tone_deltas may add
+        tones = {key for config in self.response_strategies.values()
+                 for key in config['tone_adjustments']}
+        tones.update(_CONTEXT_TONES)
+        self._tone_index = {key: i for i, key in enumerate(sorted(tones))}
+        self._tone_vectors = {}
+        for name, config in self.response_strategies.items():
+            vector = np.full(len(self._tone_index), 0.5)
+            for key, value in config['tone_adjustments'].items():
+                vector[self._tone_index[key]] = value
+            self._tone_vectors[name] = vector
+        
+    def _score_all_strategies(self, primary_emotion: Optional[str], topic: str,
+                              urgency: str, goals) -> "np.ndarray":
+        """Score every strategy at once; returns a capped score array in _strategy_names order"""
+        scores = np.zeros(len(self._strategy_names))
+        row = self._emotion_ids.get(primary_emotion)
+        if row is not None:
+            scores += self._emo_strat_matrix[row]
+        goal_rows = sorted({self._goal_ids[g] for g in goals if g in self._goal_ids})
+        if goal_rows:
+            scores += self._goal_strat_matrix[goal_rows].sum(axis=0) * 0.15
+        row = self._urgency_ids.get(urgency)
+        if row is not None:
+            scores += self._urgency_strat_matrix[row]
+        row = self._topic_ids.get(topic)
+        if row is not None:
+            scores += self._topic_strat_matrix[row]
+        return np.minimum(scores, 1.0)
+        
+    def _select_strategy(self, primary_emotion: Optional[str], topic: str,
+                         urgency: str, goals: FrozenSet[str]) -> Tuple[str, float]:
+        """Best (strategy, confidence); memoized per instance in __init__"""
+        if NUMPY_AVAILABLE:
+            # One vectorized pass over all strategies; argmax keeps the first best like max()
+            scores = self._score_all_strategies(primary_emotion, topic, urgency, goals)
+            best = int(np.argmax(scores))
+            return self._strategy_names[best], float(scores[best])
+        
+        best_name, best_score = None, float('-inf')
+        
+        # Score each strategy and keep the first best in one pass
+        for strategy_name, strategy_config in self.response_strategies.items():
+            score = self._strategy_fit(
+                strategy_name, strategy_config, primary_emotion, topic, urgency, goals)
+            if score > best_score:
+                best_name, best_score = strategy_name, score
+        
+        return best_name, best_score
+        
+    def _compile_patterns(self):
+        """Compile topic, goal and entity patterns once instead of on every call"""
+        self._topic_keyword_sets = {topic: frozenset(kw.lower() for kw in cfg['keywords'])
+                                    for topic, cfg in self.topic_patterns.items()}
+        self._topic_urgency_sets = {topic: frozenset(cfg.get('urgency_indicators', []))
+                                    for topic, cfg in self.topic_patterns.items()}
+        # keyword -> level, ordered high first so a scan can stop at its first hit
+        self._urgency_kw = {kw: level for level, keywords in self.urgency_keywords.items()
+                            for kw in keywords}
+        self._topic_regex = {topic: [re.compile(p, re.IGNORECASE) for p in cfg['patterns']]
+                             for topic, cfg in self.topic_patterns.items()}
+        self._goal_regex = {goal: [re.compile(p, re.IGNORECASE) for p in patterns]
+                            for goal, patterns in self.goal_patterns.items()}
+        self._entity_regex = re.compile(self.entity_pattern, re.IGNORECASE)
+        self._automaton = self._build_automaton() if AHOCORASICK_AVAILABLE else None
+        
+    def _build_automaton(self):
+        """Build one Aho-Corasick automaton over every literal the scorers look for"""
+        tags = defaultdict(list)
+        for topic, keywords in self._topic_keyword_sets.items():
+            for kw in keywords:
+                tags[kw].append(('topic_kw', topic))
+        for topic, indicators in self._topic_urgency_sets.items():
+            for indicator in indicators:
+                tags[indicator].append(('urgency', topic))
+        for level, keywords in self.urgency_keywords.items():
+            for kw in keywords:
+                tags[kw].append(('urgency_level', level))
+        for kw in self.formal_indicators:
+            tags[kw].append(('formality', 'formal'))
+        for kw in self.casual_indicators:
+            tags[kw].append(('formality', 'casual'))
+        
+        # Goals whose patterns are all bounded literals leave the regex path
+        for goal, patterns in self.goal_patterns.items():
+            literals = [_BOUNDED_LITERAL_RE.fullmatch(p) for p in patterns]
+            if all(literals):
+                for m in literals:
+                    tags[m.group(1)].append(('goal', goal))
+                del self._goal_regex[goal]
+        
+        automaton = ahocorasick.Automaton()
+        for word, word_tags in tags.items():
+            automaton.add_word(word, (word, tuple(word_tags)))
+        automaton.make_automaton()
+        return automaton
+        
+    def _scan(self, text: str) -> Optional[Dict[str, Dict[str, set]]]:
+        """Single pass over lowered input returning {kind: {tag: matched words}}
+        
+        Returns None when pyahocorasick is not installed.
+        """
+        if self._automaton is None:
+            return None
+        
+        hits = {'topic_kw': {}, 'urgency': {}, 'urgency_level': {}, 'formality': {}, 'goal': {}}
+        for end, (word, word_tags) in self._automaton.iter(text):
+            start = end - len(word) + 1
+            for kind, tag in word_tags:
+                # Keywords are whole tokens and goal literals sit between \b anchors
+                if kind == 'topic_kw' and not _bounded(text, start, end + 1, _is_token_char):
+                    continue
+                if kind == 'goal' and not _bounded(text, start, end + 1, _is_word_char):
+                    continue
+                hits[kind].setdefault(tag, set()).add(word)
+        
+        return hits
+        
     def _initialize_user_profile(self) -> Dict:
         """Initialize user profile with default values"""
         return {
@@ -235,29 +496,32 @@ class AdvancedContextEngine:
         Analyze the current conversation context
         """
         start_time = time.time()
+        view = self._input_view(user_input)
         
         # Extract topic and subtopics
-        topic, subtopics = self._extract_topics(user_input, conversation_history)
+        topic, subtopics = self._extract_topics(view, conversation_history)
         
         # Detect user goals
-        goals = self._detect_user_goals(user_input, conversation_history)
+        goals = self._detect_user_goals(view, conversation_history)
         
         # Determine conversation stage
         stage = self._determine_conversation_stage(conversation_history)
         
         # Assess urgency and formality
-        urgency = self._assess_urgency(user_input, topic)
-        formality = self._assess_formality(user_input, conversation_history)
+        urgency = self._assess_urgency(view, topic)
+        formality = self._assess_formality(view, conversation_history)
         
         # Track mood progression
         mood_trend = self._track_mood_trend(emotion_data, conversation_history)
         
         # Extract key entities
-        entities = self._extract_entities(user_input)
+        entities = self._extract_entities(view)
         
         # Get user preferences
         preferences = self._get_relevant_preferences(topic)
         
+        self._record_turn(user_input, topic, _primary_emotion(emotion_data))
+        
         context = ConversationContext(
             topic=topic,
             subtopics=subtopics,
@@ -271,7 +535,7 @@ class AdvancedContextEngine:
         )
         
         # Cache context for performance
-        context_key = f"{topic}_{len(conversation_history)}"
+        context_key = (topic, len(conversation_history))
         self.context_cache[context_key] = context
         
         # Log performance
@@ -285,17 +549,10 @@ class AdvancedContextEngine:
         """
         Generate optimal response strategy based on context and emotion
         """
-        strategy_scores = {}
-        
-        # Score each strategy based on context and emotion
-        for strategy_name, strategy_config in self.response_strategies.items():
-            score = self._score_strategy(strategy_name, strategy_config, 
-                                       context, emotion_data)
-            strategy_scores[strategy_name] = score
-        
-        # Select best strategy
-        best_strategy = max(strategy_scores.items(), key=lambda x: x[1])
-        strategy_name, confidence = best_strategy
+        # Scores depend only on these fields, so repeated contexts hit the cache
+        strategy_name, confidence = self._cached_strategy(
+            _primary_emotion(emotion_data), context.topic,
+            context.urgency_level, frozenset(context.user_goals))
         strategy_config = self.response_strategies[strategy_name]
         
         # Generate reasoning
@@ -303,7 +560,7 @@ class AdvancedContextEngine:
         
         # Adjust tone based on context
         tone_adjustments = self._adjust_tone_for_context(
-            strategy_config['tone_adjustments'], context)
+            strategy_config['tone_adjustments'], context, strategy_name)
         
         # Generate follow-up suggestions
         follow_ups = self._generate_follow_ups(context, strategy_name)
@@ -317,72 +574,53 @@ class AdvancedContextEngine:
             follow_up_suggestions=follow_ups
         )
     
-    def _extract_topics(self, user_input: str, history: List[Dict]) -> Tuple[str, List[str]]:
+    def _input_view(self, user_input: str) -> _InputView:
+        lower = user_input.lower()
+        return _InputView(user_input, lower, frozenset(_WORD_RE.findall(lower)), self._scan(lower))
+    
+    def _extract_topics(self, view: _InputView, history: List[Dict]) -> Tuple[str, List[str]]:
         """Extract main topic and subtopics from input and history"""
-        text = user_input.lower()
-        topic_scores = {}
+        text = view.lower
+        primary_topic, best_score = 'general', 0
+        subtopics = []  # every topic with score > 0; the primary is removed at the end
+        
+        # Input is tokenized once in the view; keywords are then set lookups
+        hits, tokens = view.hits, view.tokens
+        recent_text = ' '.join([msg.get('content', '') for msg in history[-3:]])
+        history_tokens = frozenset(_WORD_RE.findall(recent_text.lower()))
         
         # Score topics based on keywords and patterns
-        for topic, config in self.topic_patterns.items():
-            score = 0
-            
-            # Check keywords
-            for keyword in config['keywords']:
-                if keyword in text:
-                    score += 1
+        for topic, keywords in self._topic_keyword_sets.items():
+            if hits is None:
+                matched = len(keywords & tokens)
+            else:
+                matched = len(hits['topic_kw'].get(topic, ()))
+            score = matched + 0.5 * len(keywords & history_tokens)
             
             # Check patterns
-            for pattern in config['patterns']:
-                if re.search(pattern, text, re.IGNORECASE):
-                    score += 2
-            
-            # Consider conversation history
-            if history:
-                recent_text = ' '.join([msg.get('content', '') for msg in history[-3:]])
-                for keyword in config['keywords']:
-                    if keyword in recent_text.lower():
-                        score += 0.5
+            score += 2 * sum(1 for pat in self._topic_regex[topic] if pat.search(text))
             
-            topic_scores[topic] = score
+            if score > 0:
+                subtopics.append(topic)
+                # Strictly greater keeps the first best topic, as max() did
+                if score > best_score:
+                    primary_topic, best_score = topic, score
         
-        # Select primary topic
-        if topic_scores and max(topic_scores.values()) > 0:
-            primary_topic = max(topic_scores.items(), key=lambda x: x[1])[0]
-        else:
-            primary_topic = 'general'
-        
-        # Extract subtopics (topics with score > 0)
-        subtopics = [topic for topic, score in topic_scores.items() 
-                    if score > 0 and topic != primary_topic]
+        if best_score > 0:
+            subtopics.remove(primary_topic)
         
         return primary_topic, subtopics
     
-    def _detect_user_goals(self, user_input: str, history: List[Dict]) -> List[str]:
+    def _detect_user_goals(self, view: _InputView, history: List[Dict]) -> List[str]:
         """Detect what the user is trying to achieve"""
-        text = user_input.lower()
+        text, hits = view.lower, view.hits
         goals = []
         
-        # Goal detection patterns
-        goal_patterns = {
-            'seeking_advice': [r'\bwhat should i\b', r'\bshould i\b', r'\badvice\b', 
-                             r'\bwhat would you\b', r'\brecommend\b'],
-            'problem_solving': [r'\bhow to\b', r'\bhow can i\b', r'\bproblem with\b',
-                              r'\bissue with\b', r'\btrouble\b'],
-            'learning': [r'\blearn\b', r'\bunderstand\b', r'\bexplain\b', 
-                        r'\bteach me\b', r'\bhow does\b'],
-            'emotional_support': [r'\bfeeling\b', r'\bupset\b', r'\bstressed\b',
-                                r'\bneed support\b', r'\bhelp me cope\b'],
-            'planning': [r'\bplan\b', r'\bschedule\b', r'\borganize\b',
-                        r'\bprepare for\b', r'\bstrategy\b'],
-            'decision_making': [r'\bdecide\b', r'\bchoose\b', r'\boptions\b',
-                              r'\bwhich one\b', r'\bcompare\b']
-        }
-        
-        for goal, patterns in goal_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    goals.append(goal)
-                    break
+        for goal in self.goal_patterns:
+            if hits is not None and goal in hits['goal']:
+                goals.append(goal)
+            elif goal in self._goal_regex and any(pat.search(text) for pat in self._goal_regex[goal]):
+                goals.append(goal)
         
         return goals if goals else ['conversation']
     
@@ -397,38 +635,36 @@ class AdvancedContextEngine:
         else:
             return 'established'
     
-    def _assess_urgency(self, user_input: str, topic: str) -> str:
+    def _assess_urgency(self, view: _InputView, topic: str) -> str:
         """Assess urgency level of the request"""
-        text = user_input.lower()
-        urgency_keywords = {
-            'high': ['urgent', 'emergency', 'asap', 'immediately', 'crisis', 'critical'],
-            'medium': ['soon', 'important', 'need help', 'worried', 'concerned'],
-            'low': ['when you can', 'eventually', 'thinking about', 'wondering']
-        }
-        
-        # Check for urgency keywords
-        for level, keywords in urgency_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
+        text, hits = view.lower, view.hits
+        if hits is not None:
+            for level in self.urgency_keywords:
+                if level in hits['urgency_level']:
                     return level
+            return 'high' if topic in hits['urgency'] else 'low'
+        
+        # Check for urgency keywords; the first hit is the highest level present
+        for keyword, level in self._urgency_kw.items():
+            if keyword in text:
+                return level
         
         # Check topic-specific urgency indicators
-        if topic in self.topic_patterns:
-            for indicator in self.topic_patterns[topic].get('urgency_indicators', []):
-                if indicator in text:
-                    return 'high'
+        if any(indicator in text for indicator in self._topic_urgency_sets.get(topic, ())):
+            return 'high'
         
         return 'low'
     
-    def _assess_formality(self, user_input: str, history: List[Dict]) -> str:
+    def _assess_formality(self, view: _InputView, history: List[Dict]) -> str:
         """Assess desired formality level"""
-        text = user_input.lower()
-        
-        formal_indicators = ['please', 'would you', 'could you', 'i would appreciate']
-        casual_indicators = ["what's", "don't", "can't", "won't", 'hey', 'hi there']
+        text, hits = view.lower, view.hits
         
-        formal_score = sum(1 for indicator in formal_indicators if indicator in text)
-        casual_score = sum(1 for indicator in casual_indicators if indicator in text)
+        if hits is not None:
+            formal_score = len(hits['formality'].get('formal', ()))
+            casual_score = len(hits['formality'].get('casual', ()))
+        else:
+            formal_score = sum(1 for indicator in self.formal_indicators if indicator in text)
+            casual_score = sum(1 for indicator in self.casual_indicators if indicator in text)
         
         if formal_score > casual_score:
             return 'formal'
@@ -438,37 +674,20 @@ class AdvancedContextEngine:
             return 'professional'
     
     def _track_mood_trend(self, emotion_data: Dict, history: List[Dict]) -> List[str]:
-        """Track mood progression over recent conversation"""
-        trend = []
+        """Track mood progression over recent conversation, oldest first"""
+        # Derived from the caller's history so each session only sees its own moods;
+        # the bounded deque keeps the last 5 once the current emotion is added
+        trend = deque((msg['emotion'] for msg in history[-5:] if msg.get('emotion')), maxlen=5)
         
-        # Add current emotion
         if emotion_data and 'primary_emotion' in emotion_data:
             trend.append(emotion_data['primary_emotion'])
         
-        # Look at recent history for emotion patterns
-        for msg in history[-5:]:
-            if 'emotion' in msg:
-                trend.append(msg['emotion'])
-        
-        return trend[-5:]  # Keep last 5 moods
+        return list(trend)
     
-    def _extract_entities(self, user_input: str) -> List[str]:
+    def _extract_entities(self, view: _InputView) -> List[str]:
         """Extract key entities (people, places, concepts)"""
-        entities = []
-        
-        # Simple entity extraction patterns
-        patterns = {
-            'person': r'\b(my|a) (friend|colleague|boss|partner|spouse|doctor|teacher)\b',
-            'place': r'\b(at|in|to) (work|home|school|hospital|office|gym)\b',
-            'time': r'\b(today|tomorrow|yesterday|this week|next month)\b'
-        }
-        
-        for entity_type, pattern in patterns.items():
-            matches = re.findall(pattern, user_input.lower())
-            entities.extend([match[1] if isinstance(match, tuple) else match 
-                           for match in matches])
-        
-        return list(set(entities))
+        # One scan; lastgroup names the entity type that matched
+        return list({m.group(m.lastgroup) for m in self._entity_regex.finditer(view.lower)})
     
     def _get_relevant_preferences(self, topic: str) -> Dict[str, float]:
         """Get user preferences relevant to current topic"""
@@ -502,28 +721,50 @@ class AdvancedContextEngine:
         
         return f"Selected {strategy_name} strategy based on: " + "; ".join(reasons)
     
-    def _adjust_tone_for_context(self, base_tone: Dict[str, float], 
-                                context: ConversationContext) -> Dict[str, float]:
-        """Adjust tone based on conversation context"""
-        adjusted_tone = base_tone.copy()
+    def _tone_deltas(self, context: ConversationContext) -> List[Tuple[str, float]]:
+        """(tone, delta) nudges for this context; each tone appears at most once"""
+        deltas = []
         
         # Adjust for formality
         if context.formality_level == 'formal':
-            adjusted_tone['professionalism'] = adjusted_tone.get('professionalism', 0.5) + 0.2
+            deltas.append(('professionalism', 0.2))
         elif context.formality_level == 'casual':
-            adjusted_tone['friendliness'] = adjusted_tone.get('friendliness', 0.5) + 0.2
+            deltas.append(('friendliness', 0.2))
         
         # Adjust for urgency
         if context.urgency_level == 'high':
-            adjusted_tone['responsiveness'] = adjusted_tone.get('responsiveness', 0.5) + 0.3
-            adjusted_tone['clarity'] = adjusted_tone.get('clarity', 0.5) + 0.2
+            deltas.append(('responsiveness', 0.3))
+            deltas.append(('clarity', 0.2))
         
         # Adjust for mood trend
         if context.user_mood_trend:
             recent_moods = context.user_mood_trend[-3:]
             if 'sad' in recent_moods or 'anxious' in recent_moods:
-                adjusted_tone['empathy'] = adjusted_tone.get('empathy', 0.5) + 0.2
-                adjusted_tone['warmth'] = adjusted_tone.get('warmth', 0.5) + 0.2
+                deltas.append(('empathy', 0.2))
+                deltas.append(('warmth', 0.2))
+        
+        return deltas
+    
+    def _adjust_tone_for_context(self, base_tone: Dict[str, float], 
+                                context: ConversationContext,
+                                strategy_name: Optional[str] = None) -> Dict[str, float]:
+        """Adjust tone based on conversation context"""
+        deltas = self._tone_deltas(context)
+        
+        if NUMPY_AVAILABLE and strategy_name in self._tone_vectors:
+            # Add and clip on the strategy's precomputed vector; absent tones start at 0.5
+            tone = self._tone_vectors[strategy_name].copy()
+            if deltas:
+                tone[[self._tone_index[key] for key, _ in deltas]] += [delta for _, delta in deltas]
+            np.clip(tone, 0.0, 1.0, out=tone)
+            values = tone.tolist()
+            keys = list(base_tone)
+            keys.extend(key for key, _ in deltas if key not in base_tone)
+            return {key: values[self._tone_index[key]] for key in keys}
+        
+        adjusted_tone = base_tone.copy()
+        for key, delta in deltas:
+            adjusted_tone[key] = adjusted_tone.get(key, 0.5) + delta
         
         # Normalize values to [0, 1]
         for key, value in adjusted_tone.items():
@@ -602,6 +843,49 @@ class AdvancedContextEngine:
             for key, value in self.user_profile[category].items():
                 self.user_profile[category][key] = min(max(value, 0.0), 1.0)
     
+    def _record_turn(self, user_input: str, topic: str, emotion: Optional[str]):
+        """Append this turn to conversation_history (called from analyze_context) and its column mirror"""
+        self.conversation_history.append({
+            'content': user_input, 'topic': topic, 'emotion': emotion,
+            'timestamp': datetime.now()
+        })
+        if self._topic_index is None:
+            return
+        
+        slot = self._turns % len(self._hist_topic_id)
+        self._hist_topic_id[slot] = self._topic_index[topic]
+        self._hist_emotion_id[slot] = (-1 if emotion is None else
+                                       self._emotion_vocab.setdefault(emotion, len(self._emotion_vocab)))
+        self._hist_len[slot] = min(len(user_input.split()), np.iinfo(np.int16).max)
+        self._turns += 1
+    
+    def _turn_patterns(self) -> Dict[str, Any]:
+        """Mood and topic counts plus mean input length over the recorded turns"""
+        if self._topic_index is None:
+            turns = self.conversation_history
+            moods = defaultdict(int)
+            topics = defaultdict(int)
+            for turn in turns:
+                topics[turn['topic']] += 1
+                if turn['emotion'] is not None:
+                    moods[turn['emotion']] += 1
+            lengths = [len(turn['content'].split()) for turn in turns]
+            average_length = sum(lengths) / len(lengths) if lengths else 0.0
+        else:
+            n = min(self._turns, len(self._hist_topic_id))
+            emotion_ids = self._hist_emotion_id[:n]
+            emotion_counts = np.bincount(emotion_ids[emotion_ids >= 0], minlength=len(self._emotion_vocab))
+            topic_counts = np.bincount(self._hist_topic_id[:n], minlength=len(self._topic_index))
+            moods = {e: int(emotion_counts[i]) for e, i in self._emotion_vocab.items() if emotion_counts[i]}
+            topics = {t: int(topic_counts[i]) for t, i in self._topic_index.items() if topic_counts[i]}
+            average_length = float(self._hist_len[:n].mean()) if n else 0.0
+        
+        return {
+            'mood_patterns': sorted(moods, key=moods.get, reverse=True),
+            'recent_topics': dict(topics),
+            'average_input_length': average_length
+        }
+    
     def get_context_summary(self, context: ConversationContext) -> Dict[str, Any]:
         """Get a summary of current context for display"""
         return {
@@ -616,18 +900,26 @@ class AdvancedContextEngine:
         }
     
     def get_analytics(self) -> Dict[str, Any]:
-        """Get analytics about context engine performance"""
+        """Get analytics about context engine performance
+        
+        mood_patterns lists emotions seen in recorded turns, most frequent first;
+        recent_topics and average_input_length cover the same turns.
+        """
+        topic_distribution = dict(self.user_profile['topic_interests'])
+        turn_patterns = self._turn_patterns()
         return {
             'total_contexts_analyzed': len(self.context_cache),
             'user_profile_maturity': {
-                'topic_interests': len(self.user_profile['topic_interests']),
+                'topic_interests': len(topic_distribution),
                 'personality_confidence': sum(self.user_profile['personality_indicators'].values()) / 5,
                 'communication_preferences_learned': len([v for v in self.user_profile['communication_preferences'].values() if v != 0.5])
             },
             'conversation_patterns': {
                 'average_session_length': self.user_profile['conversation_patterns']['typical_session_length'],
-                'topic_distribution': dict(self.user_profile['topic_interests']),
-                'mood_patterns': list(self.learning_patterns.keys()) if self.learning_patterns else []
+                'topic_distribution': topic_distribution,
+                'recent_topics': turn_patterns['recent_topics'],
+                'average_input_length': turn_patterns['average_input_length'],
+                'mood_patterns': turn_patterns['mood_patterns']
             }
         }
 
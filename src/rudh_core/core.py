@@ -4,12 +4,18 @@ Integrated emotion detection and advanced context awareness
 """
 
 import asyncio
+import heapq
 import time
 import logging
+from collections import deque
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 from typing import Dict, List, Optional, Any
 from dataclasses import asdict
 
+from cachetools import LRUCache
+
 # Import our enhanced engines
 from .emotion_engine import EnhancedEmotionEngine
 from .context_engine import AdvancedContextEngine
@@ -618,6 +624,150 @@ class EnhancedRudhCore:
         self.conversation_history = []
         self.logger.info("Session reset - user profile preserved")
 
+# Rudh's own mood after replying with each strategy
+_RUDH_MOODS = {
+    'supportive': 'caring',
+    'analytical': 'focused',
+    'motivational': 'energetic',
+    'educational': 'helpful',
+    'conversational': 'friendly'
+}
+
+# Enhanced engine labels renamed to the API's emotion vocabulary
+_API_EMOTIONS = {
+    'joyful': 'happy'
+}
+
+class RudhCore:
+    """
+    Rudh as used by the API and interactive scripts
+    Keeps one EnhancedRudhCore session per user behind the initialize /
+    process_message(user_input, user_id) / get_stats interface
+    """
+    
+    MAX_SESSIONS = 256
+    MAX_MEMORY = 1000  # exchanges kept per user
+    
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = config or {}
+        self.logger = logging.getLogger('RudhCore')
+        self.is_initialized = False
+        self.emotional_state = "neutral"
+        
+        # Per-user sessions so history, mood and learning never mix between users,
+        # each with its own bounded record of exchanges
+        self._sessions = LRUCache(maxsize=self.MAX_SESSIONS)
+        self._memory = LRUCache(maxsize=self.MAX_SESSIONS)
+        self._stats = {
+            'messages_processed': 0,
+            'total_processing_time': 0.0,
+            'average_confidence': 0.0,
+            'languages_detected': {},
+            'strategies_used': {}
+        }
+    
+    async def initialize(self) -> bool:
+        """Warm up the engines with the default session"""
+        try:
+            self._session("default")
+            self.is_initialized = True
+        except Exception as e:
+            self.logger.error(f"Rudh initialization failed: {e}")
+            self.is_initialized = False
+        return self.is_initialized
+    
+    def _session(self, user_id: str) -> EnhancedRudhCore:
+        session = self._sessions.get(user_id)
+        if session is None:
+            session = self._sessions[user_id] = EnhancedRudhCore(self.config)
+        return session
+    
+    @staticmethod
+    def _detect_language(text: str) -> str:
+        return 'tamil' if any('\u0b80' <= ch <= '\u0bff' for ch in text) else 'english'
+    
+    async def process_message(self, user_input: str, user_id: str = "default") -> Dict[str, Any]:
+        """Process one message in the user's session and shape the API reply"""
+        start_time = time.time()
+        result = await self._session(user_id).process_message(user_input)
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+        
+        emotion = result['emotion_analysis']
+        primary_emotion = _API_EMOTIONS.get(emotion['primary_emotion'], emotion['primary_emotion'])
+        strategy = result['response_strategy']
+        language = self._detect_language(user_input)
+        reply = result['response']
+        
+        self.emotional_state = _RUDH_MOODS.get(strategy['strategy_type'], 'neutral')
+        timestamp = datetime.now().isoformat()
+        response = {
+            'response': reply,
+            'emotion_detected': {
+                'primary_emotion': primary_emotion,
+                'confidence': emotion['confidence'],
+                'intensity': emotion['intensity'],
+                'secondary_emotions': emotion['secondary_emotions'],
+                'processing_time': emotion['processing_time']
+            },
+            'strategy_used': strategy['strategy_type'],
+            'timestamp': timestamp,
+            'confidence': strategy['confidence'],
+            'language_detected': language,
+            'rudh_mood': self.emotional_state
+        }
+        
+        memory = self._memory.get(user_id)
+        if memory is None:
+            memory = self._memory[user_id] = deque(maxlen=self.MAX_MEMORY)
+        memory.append({
+            'user_id': user_id,
+            'user_input': user_input,
+            'rudh_response': reply,
+            'emotion': primary_emotion,
+            'strategy_used': strategy['strategy_type'],
+            'language': language,
+            'timestamp': timestamp
+        })
+        
+        self._update_stats(strategy, language, time.time() - start_time)
+        return response
+    
+    def _update_stats(self, strategy: Dict, language: str, processing_time: float):
+        stats = self._stats
+        stats['messages_processed'] += 1
+        stats['total_processing_time'] += processing_time
+        count = stats['messages_processed']
+        stats['average_confidence'] += (strategy['confidence'] - stats['average_confidence']) / count
+        stats['languages_detected'][language] = stats['languages_detected'].get(language, 0) + 1
+        strategy_type = strategy['strategy_type']
+        stats['strategies_used'][strategy_type] = stats['strategies_used'].get(strategy_type, 0) + 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Operational statistics across all users"""
+        return {
+            **self._stats,
+            'languages_detected': dict(self._stats['languages_detected']),
+            'strategies_used': dict(self._stats['strategies_used']),
+            'active_sessions': len(self._sessions),
+            'emotional_state': self.emotional_state,
+            'is_initialized': self.is_initialized
+        }
+    
+    @property
+    def conversation_memory(self) -> List[Dict[str, Any]]:
+        """Every user's recorded exchanges, oldest first"""
+        return list(heapq.merge(*self._memory.values(), key=itemgetter('timestamp')))
+    
+    def get_conversation_history(self, user_id: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recent exchanges, optionally for one user, oldest first"""
+        if limit <= 0:
+            return []
+        if user_id is None:
+            return self.conversation_memory[-limit:]
+        memory = self._memory.get(user_id, deque())
+        return list(islice(reversed(memory), limit))[::-1]
+
 # Example usage and testing
 if __name__ == "__main__":
     print("🤖 Enhanced Rudh Core - Phase 2.2")
@@ -677,4 +827,4 @@ if __name__ == "__main__":
         print("Context-aware AI with emotion intelligence ready for deployment!")
     
     # Run the test
-    asyncio.run(test_enhanced_core())
\ No newline at end of file
+    asyncio.run(test_enhanced_core())
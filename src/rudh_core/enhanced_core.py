@@ -65,7 +65,7 @@ class ProductionRudhCore:
         # Handle response generator initialization gracefully
         try:
             self.response_generator = AdvancedResponseGenerator(
-                azure_config.__dict__ if azure_config else None
+                asdict(azure_config) if azure_config else None
             )
         except Exception as e:
             self.logger.warning(f"Response generator init with limited features: {e}")
@@ -325,6 +325,10 @@ class ProductionRudhCore:
                 conversation_context, total_processing_time
             )
             
+            # Audio and translation ran alongside steps 5-6; resolve them so the response stays JSON-serializable
+            if azure_enhanced:
+                await self._resolve_background_results(azure_enhanced)
+            
             # Step 7: Build comprehensive response
             final_response = self._build_final_response(
                 generated_response, azure_enhanced, conversation_context,
@@ -494,6 +498,19 @@ Respond as Rudh would, showing genuine understanding and providing valuable assi
         new_avg = ((current_avg * (total_convs - 1)) + processing_time) / total_convs
         self.system_metrics['average_response_time'] = new_avg
     
+    async def _resolve_background_results(self, azure_enhanced: Dict):
+        """Replace the audio/translation task handles with their results"""
+        tasks = {key: task for key in ('audio_response', 'translated_response')
+                 if isinstance(task := azure_enhanced.get(key), asyncio.Task)}
+        try:
+            for key, task in tasks.items():
+                azure_enhanced[key] = await task
+        except asyncio.CancelledError:
+            # Don't leave synthesis or translation running for an abandoned request
+            for task in tasks.values():
+                task.cancel()
+            raise
+    
     def _build_final_response(self, generated_response, azure_enhanced: Optional[Dict],
                             context, emotion_analysis: Dict,
                             timing_data: Dict) -> Dict[str, Any]:
@@ -5,6 +5,7 @@ Sophisticated response generation with personality adaptation and Azure AI integ
 """
 
 import asyncio
+import importlib.util
 import logging
 import json
 import re
@@ -13,21 +14,34 @@ from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
-# Azure AI imports (with fallbacks)
-try:
-    from azure.cognitiveservices.speech import SpeechConfig, SpeechSynthesizer
-    from azure.ai.translation.text import TextTranslationClient
-    from azure.core.credentials import AzureKeyCredential
-    AZURE_SERVICES_AVAILABLE = True
-except ImportError:
-    AZURE_SERVICES_AVAILABLE = False
-    print("Azure services not available - running in enhanced fallback mode")
+def _module_available(name: str) -> bool:
+    """Probe for a module without importing it (a missing parent package counts as absent)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
 
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# Azure AI imports (with fallbacks), attempted only when every module resolves
+AZURE_SERVICES_AVAILABLE = all(_module_available(name) for name in (
+    "azure.cognitiveservices.speech", "azure.ai.translation.text", "azure.core.credentials"
+))
+if AZURE_SERVICES_AVAILABLE:
+    # find_spec only proves the modules exist; loading them can still fail (e.g. a missing native library)
+    try:
+        from azure.cognitiveservices.speech import SpeechConfig, SpeechSynthesizer
+        from azure.ai.translation.text import TextTranslationClient
+        from azure.core.credentials import AzureKeyCredential
+    except (ImportError, OSError):
+        AZURE_SERVICES_AVAILABLE = False
+if not AZURE_SERVICES_AVAILABLE:
+    logging.getLogger('ResponseGenerator').debug("Azure services not available - running in enhanced fallback mode")
+
+OPENAI_AVAILABLE = _module_available("openai")
+if OPENAI_AVAILABLE:
+    try:
+        import openai
+    except (ImportError, OSError):
+        OPENAI_AVAILABLE = False
 
 class ResponseStyle(Enum):
     """Response style variations for personality adaptation"""
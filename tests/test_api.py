@@ -0,0 +1,121 @@
+"""
+API tests for Rudh AI Companion
+Drive the FastAPI app through TestClient against a real RudhCore
+"""
+
+import unittest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+from api import main
+from rudh_core.core import RudhCore
+
+class TestRudhAPI(unittest.TestCase):
+    """Endpoint tests with a freshly initialized RudhCore per test"""
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+
+        # Replace whatever the lifespan started with a deterministic, ready core
+        self.rudh = RudhCore()
+        self.client.portal.call(self.rudh.initialize)
+        main.app.state.rudh = self.rudh
+        main.AUDIO_CACHE.clear()
+
+    def test_root(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], main.__version__)
+
+    def test_health(self):
+        response = self.client.get("/health")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["status"], "healthy")
+        self.assertTrue(body["rudh_initialized"])
+
+    def test_health_degraded_while_warming_up(self):
+        main.app.state.rudh = RudhCore()
+        response = self.client.get("/health")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "degraded")
+        self.assertFalse(response.json()["rudh_initialized"])
+
+    def test_chat(self):
+        response = self.client.post("/chat", json={"message": "I'm feeling really sad today", "user_id": "u1"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["response"])
+        self.assertEqual(body["emotion_detected"]["primary_emotion"], "sad")
+        self.assertEqual(body["strategy_used"], "supportive")
+        self.assertEqual(body["language_detected"], "english")
+        self.assertEqual(body["rudh_mood"], "caring")
+
+    def test_repeated_message_is_processed_each_time(self):
+        for _ in range(2):
+            response = self.client.post("/chat", json={"message": "Hello", "user_id": "repeat"})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("cache-control", response.headers)
+        self.assertEqual(self.rudh.get_stats()["messages_processed"], 2)
+        self.assertEqual(len(self.rudh.get_conversation_history("repeat")), 2)
+
+    def test_chat_tamil(self):
+        response = self.client.post("/chat", json={"message": "வணக்கம் ருத்!", "user_id": "ta"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["language_detected"], "tamil")
+
+    def test_chat_batch(self):
+        messages = [{"message": "Hello Rudh", "user_id": "a"},
+                    {"message": "Can you teach me how stocks work?", "user_id": "b"}]
+        response = self.client.post("/chat/batch", json={"messages": messages})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(self.rudh.get_stats()["messages_processed"], 2)
+
+    def test_chat_batch_keeps_each_users_order(self):
+        messages = [{"message": f"Message {i}", "user_id": "same"} for i in range(5)]
+        messages.insert(2, {"message": "Hello", "user_id": "other"})
+        response = self.client.post("/chat/batch", json={"messages": messages})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 6)
+        history = self.rudh.get_conversation_history("same")
+        self.assertEqual([entry["user_input"] for entry in history], [f"Message {i}" for i in range(5)])
+
+    def test_chat_batch_rejects_oversized_batch(self):
+        messages = [{"message": "Hello"}] * (main.MAX_BATCH_MESSAGES + 1)
+        response = self.client.post("/chat/batch", json={"messages": messages})
+        self.assertEqual(response.status_code, 422)
+
+    def test_chat_stream_without_speech(self):
+        main.app.state.synth_pool = None
+        response = self.client.post("/chat/stream", json={"message": "Hello"})
+        self.assertEqual(response.status_code, 503)
+
+    def test_conversation_history_is_per_user(self):
+        self.client.post("/chat", json={"message": "Hello", "user_id": "alice"})
+        self.client.post("/chat", json={"message": "Hi there", "user_id": "bob"})
+        response = self.client.get("/conversations/alice")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["total_count"], 1)
+        self.assertEqual(body["conversations"][0]["user_input"], "Hello")
+
+    def test_stats(self):
+        self.client.post("/chat", json={"message": "Hello"})
+        response = self.client.get("/stats")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["messages_processed"], 1)
+
+    def test_unavailable_without_rudh(self):
+        main.app.state.rudh = None
+        self.assertEqual(self.client.post("/chat", json={"message": "Hello"}).status_code, 503)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -239,6 +239,16 @@ class TestAdvancedContextEngine(unittest.TestCase):
         self.assertIn('learning', context.user_goals)
         self.assertIn('explanation', strategy.content_focus)
         
+    def test_mood_trend_follows_history(self):
+        """Test mood trend comes from the given history, not other sessions"""
+        self.context_engine.analyze_context("I'm so sad", {'primary_emotion': 'sad'}, [])
+        
+        history = [{'content': 'Great news!', 'emotion': 'happy'},
+                   {'content': 'Got the job', 'emotion': 'excited'}]
+        context = self.context_engine.analyze_context("Now I'm nervous", {'primary_emotion': 'anxious'}, history)
+        
+        self.assertEqual(context.user_mood_trend, ['happy', 'excited', 'anxious'])
+        
     def test_performance_context_analysis(self):
         """Test context analysis performance"""
         user_input = "I'm stressed about work and need help with time management"
@@ -276,6 +286,50 @@ class TestAdvancedContextEngine(unittest.TestCase):
         self.assertLess(processing_time, 0.05)
         self.assertIsInstance(strategy, ResponseStrategy)
 
+class TestContextEngineBackends(unittest.TestCase):
+    """Pin analysis results so the NumPy/Aho-Corasick and pure-Python paths agree"""
+    
+    SAMPLES = [
+        ("I'm having issues with my boss at work and need advice, it's urgent!",
+         {'primary_emotion': 'stressed', 'confidence': 0.8},
+         ('work', ['seeking_advice'], 'high', 'professional', ['boss', 'work'], 'supportive', 0.95)),
+        ("Could you please explain how stock investment and mutual funds work?",
+         {'primary_emotion': 'curious', 'confidence': 0.7},
+         ('finance', ['learning'], 'low', 'formal', [], 'educational', 1.0)),
+        ("hey lol my friend and I had a fight, feeling sad",
+         {'primary_emotion': 'sad', 'confidence': 0.9},
+         ('relationships', ['emotional_support'], 'high', 'casual', ['friend'], 'supportive', 1.0)),
+        ("I feel sick and anxious about my doctor appointment tomorrow",
+         {'primary_emotion': 'anxious', 'confidence': 0.6},
+         ('health', ['conversation'], 'low', 'professional', ['doctor', 'tomorrow'], 'supportive', 1.0)),
+    ]
+    
+    def _engine(self, use_numpy, use_automaton):
+        """Build an engine with the optional accelerators switched on or off"""
+        module = sys.modules[AdvancedContextEngine.__module__]
+        self.addCleanup(setattr, module, 'NUMPY_AVAILABLE', module.NUMPY_AVAILABLE)
+        self.addCleanup(setattr, module, 'AHOCORASICK_AVAILABLE', module.AHOCORASICK_AVAILABLE)
+        module.NUMPY_AVAILABLE = use_numpy and module.NUMPY_AVAILABLE
+        module.AHOCORASICK_AVAILABLE = use_automaton and module.AHOCORASICK_AVAILABLE
+        return AdvancedContextEngine()
+    
+    def test_paths_match_pinned_results(self):
+        """Test topic, goals, urgency, formality, entities, strategy and confidence on each path"""
+        for use_numpy, use_automaton in [(True, True), (True, False), (False, True), (False, False)]:
+            engine = self._engine(use_numpy, use_automaton)
+            for user_input, emotion_data, expected in self.SAMPLES:
+                with self.subTest(numpy=use_numpy, automaton=use_automaton, user_input=user_input):
+                    context = engine.analyze_context(user_input, emotion_data, [])
+                    strategy = engine.generate_response_strategy(context, emotion_data)
+                    topic, goals, urgency, formality, entities, strategy_type, confidence = expected
+                    self.assertEqual(context.topic, topic)
+                    self.assertEqual(sorted(context.user_goals), goals)
+                    self.assertEqual(context.urgency_level, urgency)
+                    self.assertEqual(context.formality_level, formality)
+                    self.assertEqual(sorted(context.key_entities), entities)
+                    self.assertEqual(strategy.strategy_type, strategy_type)
+                    self.assertAlmostEqual(strategy.confidence, confidence, places=4)
+
 def run_all_tests():
     """Run all context engine tests"""
     print("🧪 Running Advanced Context Engine Tests - Phase 2.2")